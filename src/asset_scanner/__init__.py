@@ -1,10 +1,29 @@
-"""Main module for asset scanner package."""
+"""Main module for asset scanner package.
 
-from .models import Asset, ScanResult
-from .api import AssetAPI
-from .config import APIConfig
-from .scanner_parallel import ParallelScanner
-from .pbo_extractor import PboExtractor
+The public classes are imported on first access (PEP 562), so importing a
+single submodule such as asset_scanner.models does not pull in the API,
+scanner and PBO tooling with it.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .models import Asset, ScanResult
+    from .api import AssetAPI
+    from .config import APIConfig
+    from .scanner_parallel import ParallelScanner
+    from .pbo_extractor import PboExtractor
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'Asset': 'models',
+    'ScanResult': 'models',
+    'AssetAPI': 'api',
+    'APIConfig': 'config',
+    'ParallelScanner': 'scanner_parallel',
+    'PboExtractor': 'pbo_extractor',
+}
 
 __all__ = [
     'Asset',
@@ -13,4 +32,17 @@ __all__ = [
     'APIConfig',
     'ParallelScanner',
     'PboExtractor'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,17 +1,27 @@
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set, Pattern
+from functools import lru_cache
+from itertools import islice
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Pattern
 from pathlib import Path
 from datetime import datetime
 import threading
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .models import Asset, ScanResult
-from .cache import AssetCache
+from .cache import AssetCache, pattern_path
 from .config import APIConfig
 from .pbo_extractor import PboExtractor
 from .scanner_parallel import ParallelScanner
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Pattern:
+    """Compile a case-insensitive search pattern once per distinct string"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
 class AssetAPI:
     """Main API for asset scanning and caching"""
 
@@ -19,11 +29,15 @@ class AssetAPI:
         self._logger = logging.getLogger(__name__)
         self.config = config or APIConfig()
         self._stats_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         self._pbo_extractor = PboExtractor()
         self._cache = AssetCache(max_cache_size=self.config.max_cache_size)
         self._scanner = ParallelScanner(
             self._pbo_extractor,
-            max_workers=self.config.max_workers
+            max_workers=self.config.max_workers,
+            progress_callback=self.config.progress_callback
         )
 
     @property
@@ -55,8 +69,8 @@ class AssetAPI:
                 self._logger.warning(f"No assets found in cache file {self.config.cache_file}")
                 return False
 
-            self._cache.add_assets({str(a.path): a for a in assets})
-            self._logger.debug(f"Loaded {len(assets)} assets from {self.config.cache_file}")
+            self._cache.add_assets({a.normalized_path: a for a in assets})
+            self._logger.debug("Loaded %d assets from %s", len(assets), self.config.cache_file)
             return True
 
         except Exception as e:
@@ -67,6 +81,12 @@ class AssetAPI:
         """Clear the cache without auto-saving"""
         self._cache.clear()
 
+    def reset(self) -> None:
+        """Return to a freshly constructed state, keeping the worker pools for reuse"""
+        with self._cache_lock:
+            self._cache.clear()
+        self._scanner.reset()
+
     def is_cache_valid(self) -> bool:
         """Check if cache is still valid"""
         return self._cache.is_valid()
@@ -75,8 +95,19 @@ class AssetAPI:
         """Save cache to disk if configured"""
         self.save_cache(self.config.cache_file)
 
-    def scan(self, root_path: Path, patterns: Optional[List[Pattern]] = None) -> ScanResult:
-        """Scan for assets without auto-saving"""
+    def scan(self, root_path: Path, patterns: Optional[List[Pattern]] = None,
+             force_rescan: bool = False) -> ScanResult:
+        """Scan for assets without auto-saving
+
+        Files whose size and mtime match the previous scan are not re-read;
+        force_rescan hashes every file again, for filesystems with coarse
+        timestamps where an edit may not change either.
+        """
+        return self._scan(root_path, force_rescan)
+
+    def _scan(self, root_path: Path, force_rescan: bool = False,
+              report_progress: bool = True) -> ScanResult:
+        """Scan root_path; without report_progress, the scanner reports no progress"""
         try:
             if not root_path.exists():
                 raise FileNotFoundError(f"Directory not found: {root_path}")
@@ -85,43 +116,43 @@ class AssetAPI:
             source = root_path.name.lstrip('@')  # Normalize source name
             paths_to_scan = self._get_scannable_paths(root_path)
 
-            # Keep track of existing assets from other sources
-            other_source_assets = {
-                str(a.path): a for a in self._cache.get_all_assets()
-                if Asset.normalize_source(a.source) != source
-            }
-
-            self._logger.debug(f"Preserved {len(other_source_assets)} existing assets from other sources")
-            self._logger.debug(f"Existing asset sources: {set(a.source for a in other_source_assets.values())}")
-
             # Scan for new assets 
-            scan_results = self._scanner.scan_directories(paths_to_scan, source)
+            scan_results = self._scanner.scan_directories(paths_to_scan, source, force_rescan,
+                                                          report_progress)
 
             # Collect all new assets from this scan, ensuring proper source prefixing
             new_assets = set()
             for result in scan_results:
                 for asset in result.assets:
                     # Ensure asset paths are properly prefixed with source
-                    asset_path = str(asset.path)
+                    asset_path = asset.normalized_path
                     if not asset_path.startswith(f"{source}/"):
                         asset_path = f"{source}/{asset_path}"
-                    new_assets.add(Asset(
-                        path=Path(asset_path),
-                        source=source,
-                        last_scan=asset.last_scan,
-                        has_prefix=asset.has_prefix,
-                        pbo_path=asset.pbo_path
-                    ))
-
-            self._logger.debug(f"Added {len(new_assets)} new assets from {source}")
-
-            # Update cache with both existing and new assets
-            all_assets = dict(other_source_assets)
-            for asset in new_assets:
-                all_assets[str(asset.path)] = asset
-
-            self._logger.debug(f"Updating cache with {len(all_assets)} total assets")
-            self._cache.add_assets(all_assets)
+                    # An unchanged file comes back as the scanner's previous asset; reuse
+                    # the cached copy rather than allocating an identical one
+                    cached = self._cache.get_asset(asset_path)
+                    if (cached is not None and cached.source == source
+                            and cached.last_scan == asset.last_scan
+                            and cached.has_prefix == asset.has_prefix
+                            and cached.pbo_path == asset.pbo_path
+                            and cached.content_hash == asset.content_hash):
+                        new_assets.add(cached)
+                    else:
+                        new_assets.add(replace(asset, path=Path(asset_path), source=source))
+
+            self._logger.debug("Added %d new assets from %s", len(new_assets), source)
+
+            # Merge under lock so concurrent scans do not overwrite each other's sources
+            with self._cache_lock:
+                # Assets from other sources stay cached as they are; only the limit counts them
+                other_count = len(self._cache) - self._cache.count_by_source(source)
+                total = other_count + len(new_assets)
+                if total > self._cache.max_cache_size:
+                    raise ValueError(f"Cache size exceeded: {total} > {self._cache.max_cache_size}")
+
+                self._logger.debug("Updating cache with %d assets alongside %d from other sources",
+                                   len(new_assets), other_count)
+                self._cache.add_assets({asset.normalized_path: asset for asset in new_assets})
 
             return ScanResult(
                 assets=new_assets,
@@ -134,10 +165,59 @@ class AssetAPI:
             self._handle_error(e, f"scan failed for {root_path}")
             raise
 
+    def scan_multiple(self, paths: List[Path]) -> List[ScanResult]:
+        """Scan several directories concurrently
+
+        Concurrent scans would interleave their own progress, so the callback
+        only gets the fraction of directories finished.
+
+        Returns:
+            Scan results in the same order as paths
+        """
+        # Fail on a missing directory before any work is queued on the pool
+        for path in paths:
+            if not path.exists():
+                error = FileNotFoundError(f"Directory not found: {path}")
+                self._handle_error(error, f"scan failed for {path}")
+                raise error
+
+        if len(paths) == 1:
+            result = self.scan(paths[0])
+            if self.config.progress_callback:
+                self.config.progress_callback(str(paths[0]), 1.0)
+            return [result]
+
+        executor = self._get_executor()
+        futures = {executor.submit(self._scan, path, report_progress=False): i
+                   for i, path in enumerate(paths)}
+        results: Dict[int, ScanResult] = {}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            results[index] = future.result()
+            if self.config.progress_callback:
+                self.config.progress_callback(str(paths[index]), done / len(paths))
+
+        return [results[i] for i in range(len(paths))]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use"""
+        with self._executor_lock:
+            if not self._executor:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix="asset_api"
+                )
+            return self._executor
+
     def get_sources(self) -> Set[str]:
         """Get all unique asset sources."""
         return self._cache.get_sources()
 
+    def get_sources_frozen(self) -> FrozenSet[str]:
+        """Get all unique asset sources as a cached frozen set."""
+        return self._cache.get_sources_frozen()
+
     def _get_scannable_paths(self, root: Path) -> List[Path]:
         """Get all paths that should be scanned under root."""
         paths = []
@@ -149,15 +229,10 @@ class AssetAPI:
     def _scan_parallel(self, paths: List[Path], source: str,
                        patterns: Optional[List[Pattern]] = None) -> List[ScanResult]:
         """Perform parallel scanning of directories."""
-        self._logger.debug(f"Starting parallel scan of {len(paths)} directories for assets from {source}")
+        self._logger.debug("Starting parallel scan of %d directories for assets from %s", len(paths), source)
 
         try:
-            scanner = ParallelScanner(
-                self._scanner.pbo_extractor,
-                max_workers=self.config.max_workers or 4
-            )
-
-            return scanner.scan_directories(paths, source)
+            return self._scanner.scan_directories(paths, source)
 
         except Exception as e:
             self._handle_error(e, "parallel scan failed")
@@ -175,73 +250,98 @@ class AssetAPI:
         if asset:
             return asset
 
-        for source in self.get_sources():
-            prefixed_path = f"{source}/{path}"
-            asset = self._cache.get_asset(prefixed_path, case_sensitive)
-            if asset:
-                return asset
+        asset = self._cache.get_asset_in_sources(path, case_sensitive)
+        if asset:
+            return asset
 
         filename = path.split('/')[-1]
-        for cached_asset in self.get_all_assets():
-            if case_sensitive:
-                if cached_asset.filename == filename:
-                    return cached_asset
-            else:
-                if cached_asset.filename.lower() == filename.lower():
-                    return cached_asset
+        return self._cache.get_asset_by_filename(filename, case_sensitive)
+
+    def has_asset(self, path: str | Path, case_sensitive: bool = False) -> bool:
+        """Check whether an asset can be resolved from path"""
+        return self.get_asset(path, case_sensitive) is not None
+
+    def verify_assets(self, paths: List[str | Path]) -> Dict[str, bool]:
+        """Check which of the given paths resolve to cached assets"""
+        # Bound once rather than looked up again for every path
+        has_asset = self.has_asset
+        return {str(path): has_asset(path) for path in paths}
 
-        return None
+    def find_missing(self, paths: List[str | Path]) -> Set[str]:
+        """Get the paths that do not resolve to cached assets"""
+        has_asset = self.has_asset
+        return {str(path) for path in paths if not has_asset(path)}
 
-    def get_all_assets(self) -> Set[Asset]:
+    def get_all_assets(self) -> FrozenSet[Asset]:
         return self._cache.get_all_assets()
 
-    def get_assets_by_source(self, source: str) -> Set[Asset]:
-        if not source.startswith('@'):
-            source = f"@{source}"
-        return self._cache.get_assets_by_source(source)
+    def iter_assets(self, batch_size: int = 1000) -> Iterator[List[Asset]]:
+        """Yield cached assets in batches of at most batch_size"""
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+
+        assets = iter(self.get_all_assets())
+        while batch := list(islice(assets, batch_size)):
+            yield batch
 
-    def find_by_extension(self, extension: str) -> Set[Asset]:
-        if not extension.startswith('.'):
-            extension = f'.{extension}'
+    def get_assets_by_source(self, source: str) -> FrozenSet[Asset]:
+        return self._cache.get_assets_by_source(source)
 
-        extension = extension.lower()
-        return {
-            asset for asset in self.get_all_assets()
-            if asset.path.suffix.lower() == extension
-        }
+    def find_by_extension(self, extension: str) -> FrozenSet[Asset]:
+        return self._cache.get_assets_by_extension(extension)
 
     def find_by_pattern(self, pattern: str | Pattern) -> Set[Asset]:
         if isinstance(pattern, str):
-            pattern = re.compile(pattern, re.IGNORECASE)
-
-        assets = self.get_all_assets()
-        matches = set()
+            # Plain text needs no regex engine; the cache tests substrings
+            if re.escape(pattern) == pattern:
+                return self._cache.find_by_text(pattern)
+            pattern = _compile_pattern(pattern)
+        return self._cache.find_by_pattern(pattern)
+
+    def find_by_patterns(self, patterns: List[str]) -> Set[Asset]:
+        """Find assets matching any of patterns in a single pass
+
+        The patterns are joined into one alternation, so they must not rely
+        on numbered group references.
+        """
+        if not patterns:
+            return set()
+        combined = '|'.join(f'(?:{p})' for p in patterns)
+        return self.find_by_pattern(combined)
+
+    def _filter_by_pattern(self, assets: AbstractSet[Asset], pattern: str | Pattern) -> Set[Asset]:
+        """Get the assets whose path (without @source) matches pattern"""
+        if isinstance(pattern, str):
+            pattern = _compile_pattern(pattern)
 
-        for asset in assets:
-            path = str(asset.path).replace('\\', '/')
-            if '/' in path:
-                path = path.split('/', 1)[1] if path.startswith('@') else path
+        return {asset for asset in assets if pattern.search(pattern_path(asset))}
 
-            if pattern.search(path):
-                matches.add(asset)
+    def get_asset_tree(self) -> Mapping[str, FrozenSet[Asset]]:
+        """Get cached assets grouped by parent directory"""
+        return self._cache.get_asset_tree()
 
-        return matches
+    def find_related(self, asset: Asset, include_duplicates: bool = False) -> Set[Asset]:
+        """Find assets in the same directory as asset, optionally with content duplicates"""
+        return self._cache.find_related(asset, include_duplicates)
 
     def find_duplicates(self) -> Dict[str, Set[Asset]]:
         return self._cache.find_duplicates()
 
-    def find_by_criteria(self, criteria: Dict[str, Any]) -> Set[Asset]:
-        assets = self.get_all_assets()
+    def find_content_duplicates(self) -> Dict[str, Set[Asset]]:
+        """Find loose assets with identical file contents"""
+        return self._cache.find_content_duplicates()
 
-        for key, value in criteria.items():
-            if key == 'extension':
-                assets &= self.find_by_extension(value)
-            elif key == 'pattern':
-                assets &= self.find_by_pattern(value)
-            elif key == 'source':
-                assets &= self.get_assets_by_source(value)
+    def find_by_criteria(self, criteria: Dict[str, Any]) -> FrozenSet[Asset]:
+        # Narrow with the indexed lookups first so the regex only runs on survivors
+        assets: AbstractSet[Asset] = self.get_all_assets()
+        if 'extension' in criteria:
+            assets = self.find_by_extension(criteria['extension'])
+        if 'source' in criteria:
+            assets = assets & self.get_assets_by_source(criteria['source'])
+        if 'pattern' in criteria:
+            assets = self._filter_by_pattern(assets, criteria['pattern'])
 
-        return assets
+        return frozenset(assets)
 
     def _handle_error(self, error: Exception, context: str = "") -> None:
         if self.config and self.config.error_handler:
@@ -254,7 +354,12 @@ class AssetAPI:
         self._logger.error(f"Error in {context}: {error}")
 
     def cleanup(self) -> None:
-        print("Cleanup")
+        """Shut down the API and scanner worker pools"""
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._scanner.shutdown()
 
     def shutdown(self) -> None:
         try:
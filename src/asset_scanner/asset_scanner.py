@@ -22,7 +22,7 @@ class AssetScanner:
                         '.jpg', '.png', '.cpp', '.hpp', '.rvmat', '.rtm',
                         '.bin', '.ext'
                         }
-    CODE_EXTENSIONS = {'.cpp', '.hpp', '.sqf'}
+    CODE_EXTENSIONS = frozenset({'.cpp', '.hpp', '.sqf'})
 
     def __init__(self, cache_dir: Path, pbo_timeout: int = 30):
         if not cache_dir.exists():
@@ -1,61 +1,168 @@
 import json
 import logging
-from typing import Dict, Set, Optional
+import pickle
+import re
+import sys
+import time
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Pattern, Set, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 
 from .models import Asset
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the json module is used without it
+    orjson = None
+
+# Cache files with this suffix are stored with pickle instead of JSON
+PICKLE_SUFFIX = '.pkl'
+
+# Wall-clock time of monotonic reading zero, for saving and restoring update
+# times. Sampled once at import, so a fixed monotonic reading always saves as
+# the same timestamp; saved times drift by however far the wall clock moves
+# against the monotonic clock afterwards (suspend, manual or NTP adjustments).
+_MONOTONIC_EPOCH = datetime.now() - timedelta(microseconds=time.monotonic_ns() // 1000)
+
+
+def pattern_path(asset: Asset) -> str:
+    """Path that search patterns are matched against, without any @source prefix"""
+    path = asset.normalized_path
+    if path.startswith('@') and '/' in path:
+        return path.split('/', 1)[1]
+    return path
+
 class AssetCache:
     """Simple in-memory cache for asset data"""
     
     def __init__(self, max_cache_size: int = 1_000_000):
         self._assets: Dict[str, Asset] = {}
+        # Lookup indexes kept in step with _assets by _store_asset
+        self._by_lower: Dict[str, str] = {}
+        # Lower-cased path below its first component -> stored paths
+        self._by_relative: Dict[str, List[str]] = {}
+        self._by_name: Dict[str, List[Asset]] = {}
+        self._by_ext: Dict[str, Set[Asset]] = {}
+        self._by_source: Dict[str, Set[Asset]] = {}
+        self._by_parent: Dict[str, Set[Asset]] = {}
+        self._by_hash: Dict[str, Set[Asset]] = {}
+        self._snapshot: Optional[FrozenSet[Asset]] = None
+        self._sources_snapshot: Optional[FrozenSet[str]] = None
+        # Parallel (pattern paths, lower-cased paths, assets) columns so pattern
+        # scans read plain strings; the lower-cased column is None unless all ASCII
+        self._pattern_columns: Optional[Tuple[List[str], Optional[List[str]], List[Asset]]] = None
+        # Frozen copies of index buckets handed out by queries, dropped on change
+        self._ext_views: Dict[str, FrozenSet[Asset]] = {}
+        self._source_views: Dict[str, FrozenSet[Asset]] = {}
+        self._parent_views: Dict[str, FrozenSet[Asset]] = {}
+        # Read-only directory tree of the views above, rebuilt after a change
+        self._tree_snapshot: Optional[Mapping[str, FrozenSet[Asset]]] = None
         self.max_cache_size = max_cache_size
-        self._last_updated = datetime.now()
-        self._max_age = timedelta(hours=1)
+        # Monotonic nanoseconds: validity checks skip datetime arithmetic and
+        # are unaffected by wall clock changes
+        self._last_updated_ns = time.monotonic_ns()
+        self._max_age_ns = 3600 * 1_000_000_000
         self._logger = logging.getLogger(__name__)
 
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def _metadata(self) -> dict:
+        """Cache settings stored alongside the assets"""
+        return {
+            'last_updated': (_MONOTONIC_EPOCH + timedelta(microseconds=self._last_updated_ns // 1000)).isoformat(),
+            'max_age_seconds': self._max_age_ns / 1_000_000_000,
+            'max_cache_size': self.max_cache_size
+        }
+
+    def _asset_dicts(self) -> Iterator[Tuple[str, dict]]:
+        """Yield (path, serialized asset) pairs for every cached asset"""
+        # Assets from one PBO share a scan time; render each distinct one once
+        stamps: Dict[datetime, str] = {}
+        for path, asset in self._assets.items():
+            stamp = stamps.get(asset.last_scan)
+            if stamp is None:
+                stamp = stamps[asset.last_scan] = asset.last_scan.isoformat()
+            yield path, asset.to_dict(last_scan=stamp)
+
     def to_serializable(self) -> dict:
         """Convert cache to serializable format"""
         return {
-            'assets': {
-                path: asset.to_dict() for path, asset in self._assets.items()
-            },
-            'last_updated': self._last_updated.isoformat(),
-            'max_age_seconds': self._max_age.total_seconds(),
-            'max_cache_size': self.max_cache_size
+            'assets': dict(self._asset_dicts()),
+            **self._metadata()
         }
 
     def save_to_disk(self, path: Path) -> None:
-        """Save cache to disk as JSON"""
+        """Save cache to disk
+
+        Paths ending in PICKLE_SUFFIX are written with pickle, which skips the
+        per-field JSON conversion; anything else is written as JSON.
+        """
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open('w', encoding='utf-8') as f:
-                json.dump(self.to_serializable(), f, indent=2)
+            if path.suffix == PICKLE_SUFFIX:
+                with path.open('wb') as f:
+                    pickle.dump({'assets': self._assets, **self._metadata()}, f, protocol=5)
+            elif orjson is not None:
+                path.write_bytes(orjson.dumps(self.to_serializable(), option=orjson.OPT_INDENT_2))
+            else:
+                with path.open('w', encoding='utf-8') as f:
+                    json.dump(self.to_serializable(), f, indent=2)
             self._logger.info(f"Cache saved to {path}")
         except Exception as e:
             self._logger.error(f"Failed to save cache to {path}: {e}")
             raise
 
+    def stream_to_disk(self, path: Path) -> None:
+        """Save cache to disk as compact JSON, one asset at a time
+
+        Unlike save_to_disk, the full serializable dict is never built, so
+        memory stays flat for large caches. The file loads with load_from_disk.
+        """
+        dumps = orjson.dumps if orjson is not None else lambda obj: json.dumps(obj).encode()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open('wb', buffering=1 << 20) as f:
+                # Reopen the metadata object to append the assets member
+                f.write(dumps(self._metadata())[:-1] + b',"assets":{')
+                separator = b''
+                for key, data in self._asset_dicts():
+                    f.write(separator + dumps(key) + b':' + dumps(data))
+                    separator = b','
+                f.write(b'}}')
+            self._logger.info(f"Cache streamed to {path}")
+        except Exception as e:
+            self._logger.error(f"Failed to save cache to {path}: {e}")
+            raise
+
     @classmethod
     def load_from_disk(cls, path: Path) -> 'AssetCache':
-        """Load cache from disk"""
+        """Load cache from disk
+
+        Pickle caches must only be loaded from files this package wrote, as
+        unpickling untrusted data can run arbitrary code.
+        """
         try:
-            with path.open('r', encoding='utf-8') as f:
-                data = json.load(f)
+            if path.suffix == PICKLE_SUFFIX:
+                with path.open('rb') as f:
+                    data = pickle.load(f)
+                assets = data['assets']
+            else:
+                if orjson is not None:
+                    data = orjson.loads(path.read_bytes())
+                else:
+                    with path.open('r', encoding='utf-8') as f:
+                        data = json.load(f)
+                assets = cls._assets_from_dicts(data['assets'])
 
             cache = cls(max_cache_size=data.get('max_cache_size', 1_000_000))
-            
-            # Load assets using Asset.from_dict
-            cache._assets = {
-                str(path): Asset.from_dict(asset_data)
-                for path, asset_data in data['assets'].items()
-            }
+            cache.add_assets(assets)
             
             # Restore cache metadata
-            cache._last_updated = datetime.fromisoformat(data['last_updated'])
-            cache._max_age = timedelta(seconds=float(data['max_age_seconds']))
+            last_updated = datetime.fromisoformat(data['last_updated'])
+            cache._last_updated_ns = (last_updated - _MONOTONIC_EPOCH) // timedelta(microseconds=1) * 1000
+            cache._max_age_ns = int(float(data['max_age_seconds']) * 1_000_000_000)
             
             cache._logger.info(f"Cache loaded from {path}")
             return cache
@@ -65,18 +172,95 @@ class AssetCache:
             cache._logger.error(f"Failed to load cache from {path}: {e}")
             return cache
 
+    @staticmethod
+    def _assets_from_dicts(items: Dict[str, dict]) -> Dict[str, Asset]:
+        """Rebuild serialized assets, parsing each distinct scan time and PBO path once"""
+        stamps: Dict[str, datetime] = {}
+        pbo_paths: Dict[str, Path] = {}
+        assets = {}
+        for key, data in items.items():
+            stamp = data['last_scan']
+            last_scan = stamps.get(stamp)
+            if last_scan is None:
+                last_scan = stamps[stamp] = datetime.fromisoformat(stamp)
+            pbo = data['pbo_path']
+            pbo_path = None
+            if pbo:
+                pbo_path = pbo_paths.get(pbo)
+                if pbo_path is None:
+                    pbo_path = pbo_paths[pbo] = Path(pbo)
+            assets[key] = Asset.from_dict(data, last_scan=last_scan, pbo_path=pbo_path)
+        return assets
+
     def add_assets(self, assets: Dict[str, Asset]) -> None:
-        """Add or update assets in cache"""
-        if len(assets) > self.max_cache_size:
-            raise ValueError(f"Cache size exceeded: {len(assets)} > {self.max_cache_size}")
-            
+        """Add or update assets in cache
+
+        Raises ValueError, leaving the cache unchanged, if the assets not
+        already cached would take it past max_cache_size.
+        """
+        normalized = {str(path).replace('\\', '/'): asset for path, asset in assets.items()}
+        projected = len(self._assets) + len(normalized)
+        if projected > self.max_cache_size:
+            # Replacements do not grow the cache; only count paths not yet cached
+            projected = len(self._assets) + sum(1 for path in normalized if path not in self._assets)
+            if projected > self.max_cache_size:
+                raise ValueError(f"Cache size exceeded: {projected} > {self.max_cache_size}")
+
         # Update existing assets or add new ones
-        for path, asset in assets.items():
-            normalized_path = str(path).replace('\\', '/')
-            self._assets[normalized_path] = asset
+        for path, asset in normalized.items():
+            self._store_asset(path, asset)
             
-        self._last_updated = datetime.now()
-        self._logger.debug(f"Cache updated with {len(assets)} assets")
+        self._snapshot = None
+        self._sources_snapshot = None
+        self._pattern_columns = None
+        self._tree_snapshot = None
+        self._last_updated_ns = time.monotonic_ns()
+        self._logger.debug("Cache updated with %d assets", len(assets))
+
+    def _store_asset(self, path: str, asset: Asset) -> None:
+        """Store a single asset and update the lookup indexes"""
+        previous = self._assets.get(path)
+        if previous is not None:
+            self._by_name[previous.filename.lower()].remove(previous)
+            ext = previous.extension
+            self._by_ext[ext].discard(previous)
+            self._ext_views.pop(ext, None)
+            source = previous.source.strip('@')
+            self._by_source[source].discard(previous)
+            self._source_views.pop(source, None)
+            if not self._by_source[source]:
+                del self._by_source[source]
+            parent = previous.parent_path
+            self._by_parent[parent].discard(previous)
+            self._parent_views.pop(parent, None)
+            if not self._by_parent[parent]:
+                del self._by_parent[parent]
+            if previous.content_hash:
+                self._by_hash[previous.content_hash].discard(previous)
+                if not self._by_hash[previous.content_hash]:
+                    del self._by_hash[previous.content_hash]
+
+        else:
+            # Stored paths are only ever replaced, so each is indexed once
+            _, sep, relative = path.partition('/')
+            if sep:
+                self._by_relative.setdefault(relative.lower(), []).append(path)
+
+        self._assets[path] = asset
+        self._by_lower.setdefault(path.lower(), path)
+        self._by_name.setdefault(asset.filename.lower(), []).append(asset)
+        # Only the views of buckets that change are dropped; others stay valid
+        ext = asset.extension
+        self._by_ext.setdefault(ext, set()).add(asset)
+        self._ext_views.pop(ext, None)
+        source = asset.source.strip('@')
+        self._by_source.setdefault(source, set()).add(asset)
+        self._source_views.pop(source, None)
+        parent = sys.intern(asset.parent_path)
+        self._by_parent.setdefault(parent, set()).add(asset)
+        self._parent_views.pop(parent, None)
+        if asset.content_hash:
+            self._by_hash.setdefault(asset.content_hash, set()).add(asset)
 
     def get_asset(self, path: str | Path, case_sensitive: bool = True) -> Optional[Asset]:
         """Get asset by path"""
@@ -85,40 +269,85 @@ class AssetCache:
         if case_sensitive:
             return self._assets.get(path_str)
         
-        path_lower = path_str.lower()
-        for stored_path, asset in self._assets.items():
-            if stored_path.lower() == path_lower:
-                return asset
+        stored_path = self._by_lower.get(path_str.lower())
+        return self._assets[stored_path] if stored_path is not None else None
+
+    def get_asset_in_sources(self, path: str, case_sensitive: bool = True) -> Optional[Asset]:
+        """Get the asset stored as <source>/path for any cached source"""
+        for stored in self._by_relative.get(path.lower(), ()):
+            head, _, relative = stored.partition('/')
+            if head in self._by_source and (not case_sensitive or relative == path):
+                return self._assets[stored]
         return None
 
-    def get_assets_by_source(self, source: str) -> Set[Asset]:
+    def get_asset_by_filename(self, filename: str, case_sensitive: bool = True) -> Optional[Asset]:
+        """Get the first cached asset with the given filename"""
+        candidates = self._by_name.get(filename.lower(), [])
+        if not case_sensitive:
+            return candidates[0] if candidates else None
+        return next((a for a in candidates if a.filename == filename), None)
+
+    @staticmethod
+    def _index_view(views: Dict[str, FrozenSet[Asset]], index: Dict[str, Set[Asset]],
+                    key: str) -> FrozenSet[Asset]:
+        """Get a frozen copy of an index bucket, reused until the cache changes"""
+        view = views.get(key)
+        if view is None:
+            view = views[key] = frozenset(index.get(key, ()))
+        return view
+
+    def get_assets_by_source(self, source: str) -> FrozenSet[Asset]:
         """Get all assets from a specific source"""
-        clean_source = source.strip('@')
-        return {
-            asset for asset in self._assets.values()
-            if asset.source.strip('@') == clean_source
-        }
+        return self._index_view(self._source_views, self._by_source, source.strip('@'))
+
+    def count_by_source(self, source: str) -> int:
+        """Get the number of cached assets from a specific source"""
+        return len(self._by_source.get(source.strip('@'), ()))
 
-    def get_assets_by_extension(self, extension: str) -> Set[Asset]:
+    def get_assets_by_extension(self, extension: str) -> FrozenSet[Asset]:
         """Get assets by file extension"""
         ext = extension.lower()
         if not ext.startswith('.'):
             ext = f'.{ext}'
             
-        return {
-            asset for asset in self._assets.values()
-            if asset.path.suffix.lower() == ext
-        }
+        return self._index_view(self._ext_views, self._by_ext, ext)
+
+    def get_asset_tree(self) -> Mapping[str, FrozenSet[Asset]]:
+        """Get a read-only snapshot of cached assets grouped by parent directory
+
+        The snapshot is reused until the cache changes, and rebuilding it only
+        refreezes the directories that changed.
+        """
+        if self._tree_snapshot is None:
+            views, index = self._parent_views, self._by_parent
+            self._tree_snapshot = MappingProxyType({
+                parent: self._index_view(views, index, parent) for parent in index
+            })
+        return self._tree_snapshot
+
+    def find_related(self, asset: Asset, include_duplicates: bool = False) -> Set[Asset]:
+        """Get other assets in the same directory as asset
+
+        With include_duplicates, assets elsewhere with identical contents are
+        returned as well.
+        """
+        related = set(self._by_parent.get(asset.parent_path, ()))
+        if include_duplicates and asset.content_hash:
+            related |= self._by_hash.get(asset.content_hash, set())
+        related.discard(asset)
+        return related
 
     def find_duplicates(self) -> Dict[str, Set[Asset]]:
         """Find assets with duplicate filenames"""
         by_name: Dict[str, Set[Asset]] = {}
-        
-        for asset in self._assets.values():
-            name = asset.path.name
-            if name not in by_name:
-                by_name[name] = set()
-            by_name[name].add(asset)
+
+        # Names are exact, but a duplicate always shares a case-folded
+        # filename bucket, so single-entry buckets can be skipped unread
+        for candidates in self._by_name.values():
+            if len(candidates) < 2:
+                continue
+            for asset in candidates:
+                by_name.setdefault(asset.filename, set()).add(asset)
 
         return {
             name: assets 
@@ -126,19 +355,76 @@ class AssetCache:
             if len(assets) > 1
         }
 
-    def get_all_assets(self) -> Set[Asset]:
-        """Get all cached assets"""
-        return set(self._assets.values())
+    def find_content_duplicates(self) -> Dict[str, Set[Asset]]:
+        """Find assets with identical contents, keyed by content hash"""
+        return {
+            digest: set(assets)
+            for digest, assets in self._by_hash.items()
+            if len(assets) > 1
+        }
+
+    def get_all_assets(self) -> FrozenSet[Asset]:
+        """Get all cached assets, reusing the snapshot until the cache changes"""
+        if self._snapshot is None:
+            self._snapshot = frozenset(self._assets.values())
+        return self._snapshot
+
+    def _get_pattern_columns(self) -> Tuple[List[str], Optional[List[str]], List[Asset]]:
+        if self._pattern_columns is None:
+            assets = list(self._assets.values())
+            paths = [pattern_path(a) for a in assets]
+            # str.lower only agrees with re.IGNORECASE on ASCII text
+            lowered = [p.lower() for p in paths] if all(map(str.isascii, paths)) else None
+            self._pattern_columns = (paths, lowered, assets)
+        return self._pattern_columns
+
+    def find_by_pattern(self, pattern: Pattern) -> Set[Asset]:
+        """Get assets whose pattern path matches the compiled pattern"""
+        paths, _, assets = self._get_pattern_columns()
+        search = pattern.search
+        return {asset for path, asset in zip(paths, assets) if search(path)}
+
+    def find_by_text(self, text: str) -> Set[Asset]:
+        """Get assets whose pattern path contains text, ignoring case
+
+        Equivalent to a case-insensitive search for re.escape(text), but a
+        substring test where the text and cached paths are all ASCII.
+        """
+        _, lowered, assets = self._get_pattern_columns()
+        if lowered is None or not text.isascii():
+            return self.find_by_pattern(re.compile(re.escape(text), re.IGNORECASE))
+        needle = text.lower()
+        return {asset for path, asset in zip(lowered, assets) if needle in path}
 
     def get_sources(self) -> Set[str]:
         """Get all unique asset sources"""
-        return {asset.source for asset in self._assets.values()}
+        return set(self._by_source)
+
+    def get_sources_frozen(self) -> FrozenSet[str]:
+        """Get all unique asset sources, reusing the snapshot until the cache changes"""
+        if self._sources_snapshot is None:
+            self._sources_snapshot = frozenset(self._by_source)
+        return self._sources_snapshot
 
     def is_valid(self) -> bool:
         """Check if cache is still valid"""
-        return datetime.now() - self._last_updated < self._max_age
+        return time.monotonic_ns() - self._last_updated_ns < self._max_age_ns
 
     def clear(self) -> None:
         """Clear the cache"""
         self._assets.clear()
-        self._last_updated = datetime.now()
+        self._by_lower.clear()
+        self._by_relative.clear()
+        self._by_name.clear()
+        self._by_ext.clear()
+        self._by_source.clear()
+        self._by_parent.clear()
+        self._by_hash.clear()
+        self._snapshot = None
+        self._sources_snapshot = None
+        self._pattern_columns = None
+        self._tree_snapshot = None
+        self._ext_views.clear()
+        self._source_views.clear()
+        self._parent_views.clear()
+        self._last_updated_ns = time.monotonic_ns()
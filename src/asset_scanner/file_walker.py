@@ -0,0 +1,24 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+
+def iter_files(root: Path) -> Iterator[os.DirEntry]:
+    """Yield file entries below root using os.scandir
+
+    DirEntry keeps the file type from the directory listing, so no extra
+    stat call is needed per entry. Unreadable directories are skipped and
+    symlinked directories are not followed, matching Path.rglob.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            continue
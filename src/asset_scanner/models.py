@@ -1,10 +1,17 @@
-from dataclasses import dataclass, field, asdict
-import json
+from dataclasses import dataclass, field, fields
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator, Set, Optional
 
-@dataclass(frozen=True)
+
+def file_extension(name: str) -> str:
+    """Lower-case suffix of a file name, by the same rule as PurePath.suffix"""
+    dot = name.rfind('.')
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+
+
+@dataclass(frozen=True, slots=True)
 class Asset:
     """Represents a scanned asset file"""
     path: Path
@@ -12,25 +19,78 @@ class Asset:
     last_scan: datetime
     has_prefix: bool = True
     pbo_path: Optional[Path] = None
+    # Digest of the file contents, only known for loose files
+    content_hash: Optional[str] = field(default=None, compare=False)
+    # File size and modification time at scan, used to skip unchanged files
+    size: Optional[int] = field(default=None, compare=False)
+    mtime: Optional[float] = field(default=None, compare=False)
+    # String forms of path, computed once so lookups do not re-render the Path
+    _path_str: str = field(init=False, repr=False, compare=False)
+    _path_posix: str = field(init=False, repr=False, compare=False)
+    # Lower-case suffix, interned as a handful of extensions cover every asset
+    _extension: str = field(init=False, repr=False, compare=False)
+    # Assets sit in several index sets, so the field hash is computed only once
+    _hash: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.path:
-            normalized = str(self.path).replace('\\', '/').strip('/')
-            object.__setattr__(self, 'path', Path(normalized))
+            object.__setattr__(self, 'path', self._normalize_path(self.path))
+        object.__setattr__(self, '_path_str', str(self.path))
+        object.__setattr__(self, '_path_posix', self.path.as_posix())
+        extension = file_extension(self._path_posix.rpartition('/')[2])
+        object.__setattr__(self, '_extension', sys.intern(extension))
         if self.pbo_path:
-            normalized = str(self.pbo_path).replace('\\', '/').strip('/')
-            object.__setattr__(self, 'pbo_path', Path(normalized))
+            object.__setattr__(self, 'pbo_path', self._normalize_path(self.pbo_path))
         if not self.source:
             raise ValueError("Source cannot be empty")
             
-        # Normalize source by stripping @ prefix
-        normalized_source = self.source.lstrip('@')
-        if normalized_source != self.source:
-            object.__setattr__(self, 'source', normalized_source)
+        # Normalize source by stripping @ prefix; interned as few distinct sources are shared by many assets
+        object.__setattr__(self, 'source', sys.intern(self.source.lstrip('@')))
+        object.__setattr__(self, '_hash', self._field_hash())
+
+    def _field_hash(self) -> int:
+        return hash((self.path, self.source, self.last_scan, self.has_prefix, self.pbo_path))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple:
+        # dataclass(slots=True) replaces a custom __setstate__ on Python 3.10,
+        # so unpickling goes through _restore_asset instead. The cached hash is
+        # left out: string hashes differ between interpreter runs.
+        return _restore_asset, (tuple(getattr(self, name) for name in _PICKLED_FIELDS),)
+
+    @staticmethod
+    def _normalize_path(path: Path | str) -> Path:
+        """Return path with forward slashes and no leading/trailing slash
+
+        Already-normalized Path objects are returned as-is rather than rebuilt.
+        """
+        path_str = str(path)
+        normalized = path_str.replace('\\', '/').strip('/')
+        if normalized == path_str and isinstance(path, Path):
+            return path
+        return Path(normalized)
+
+    @property
+    def path_str(self) -> str:
+        """str(path), computed once at construction"""
+        return self._path_str
+
+    @property
+    def extension(self) -> str:
+        """Lower-case file suffix including the dot, or '' if there is none"""
+        return self._extension
 
     @property
     def normalized_path(self) -> str:
-        return str(self.path).replace('\\', '/')
+        return self._path_posix
+
+    @property
+    def parent_path(self) -> str:
+        """Posix form of the parent directory, split from the cached path string"""
+        head, sep, _ = self._path_posix.rpartition('/')
+        return head if sep else '.'
 
     @property 
     def filename(self) -> str:
@@ -41,27 +101,64 @@ class Asset:
         """Remove @ prefix from source name"""
         return source.lstrip('@')
 
-    def to_dict(self) -> dict:
-        """Convert asset to dictionary for serialization"""
+    def to_dict(self, *, last_scan: Optional[str] = None) -> dict:
+        """Convert asset to dictionary for serialization
+
+        last_scan may be passed pre-rendered by callers that serialize many
+        assets sharing one scan time.
+        """
         return {
-            'path': str(self.path),
+            'path': self._path_str,
             'source': self.source,
-            'last_scan': self.last_scan.isoformat(),
+            'last_scan': last_scan or self.last_scan.isoformat(),
             'has_prefix': self.has_prefix,
-            'pbo_path': str(self.pbo_path) if self.pbo_path else None
+            'pbo_path': str(self.pbo_path) if self.pbo_path else None,
+            'content_hash': self.content_hash,
+            'size': self.size,
+            'mtime': self.mtime
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> 'Asset':
-        """Create asset from dictionary"""
+    def from_dict(
+        cls,
+        data: dict,
+        *,
+        last_scan: Optional[datetime] = None,
+        pbo_path: Optional[Path] = None
+    ) -> 'Asset':
+        """Create asset from dictionary
+
+        last_scan and pbo_path may be passed pre-parsed by callers that load
+        many assets sharing one scan time or source PBO.
+        """
+        if pbo_path is None and data['pbo_path']:
+            pbo_path = Path(data['pbo_path'])
         return cls(
             path=Path(data['path']),
             source=data['source'],
-            last_scan=datetime.fromisoformat(data['last_scan']),
+            last_scan=last_scan or datetime.fromisoformat(data['last_scan']),
             has_prefix=data['has_prefix'],
-            pbo_path=Path(data['pbo_path']) if data['pbo_path'] else None
+            pbo_path=pbo_path,
+            content_hash=data.get('content_hash'),
+            size=data.get('size'),
+            mtime=data.get('mtime')
         )
 
+
+_PICKLED_FIELDS = tuple(f.name for f in fields(Asset) if f.name != '_hash')
+
+
+def _restore_asset(state: tuple) -> Asset:
+    """Rebuild a pickled Asset without re-running path normalization"""
+    asset = object.__new__(Asset)
+    for name, value in zip(_PICKLED_FIELDS, state):
+        object.__setattr__(asset, name, value)
+    # Unpickled strings are fresh copies; restore the shared interned ones
+    object.__setattr__(asset, 'source', sys.intern(asset.source))
+    object.__setattr__(asset, '_extension', sys.intern(asset._extension))
+    object.__setattr__(asset, '_hash', asset._field_hash())
+    return asset
+
 @dataclass(frozen=True)
 class ScanResult:
     """Contains results of an asset scan"""
@@ -80,6 +177,6 @@ class ScanResult:
 
     def to_dict(self) -> dict:
         return {
-            'assets': [str(asset.path) for asset in self.assets],
+            'assets': [asset._path_str for asset in self.assets],
             'scan_time': self.scan_time.isoformat()
         }
\ No newline at end of file
@@ -1,18 +1,55 @@
 import logging
+import os
+import re
 import subprocess
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Set, List
+from typing import Any, Callable, Dict, Optional, Set, List, Tuple
 import shutil
 import tempfile
 import threading
-import uuid
 
 logger = logging.getLogger(__name__)
 
+# Line boundaries recognised by str.splitlines
+_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_END = re.compile(f'[{_LINE_BREAKS}]')
+
+
+def _find_line_start(text: str, token: str, end: Optional[int] = None) -> int:
+    """Index of the first line of text[:end] starting with token, or -1"""
+    index = text.find(token, 0, end)
+    while index > 0 and text[index - 1] not in _LINE_BREAKS:
+        index = text.find(token, index + 1, end)
+    return index
+
+@lru_cache(maxsize=64)
+def _listing_prefix(stdout: str) -> Optional[str]:
+    """Parse the prefix out of extractpbo listing output
+
+    Cached listings are passed in again on every rescan of a PBO, so the
+    parse runs once per listing; the string's cached hash keeps hits cheap.
+    """
+    # Locate the line with str.find rather than splitting the whole listing;
+    # a PboPrefix line only wins if it comes before the first prefix= line
+    start, separator = _find_line_start(stdout, 'prefix='), '='
+    pbo_prefix = _find_line_start(stdout, 'PboPrefix', start if start >= 0 else None)
+    if pbo_prefix >= 0:
+        start, separator = pbo_prefix, ':'
+    if start < 0:
+        return None
+    end = _LINE_END.search(stdout, start)
+    line = stdout[start:end.start() if end else len(stdout)]
+    prefix = line.split(separator, 1)[1].strip().strip(';')
+    return prefix.replace('\\', '/')
+
 class PboExtractor:
     """Helper class for PBO file operations using extractpbo tool"""
     
-    CODE_EXTENSIONS = {'.cpp', '.hpp', '.sqf'}
+    # Number of listing and scan results kept, least recently used evicted first
+    SCAN_CACHE_SIZE = 64
+    CODE_EXTENSIONS = frozenset({'.cpp', '.hpp', '.sqf'})
     BIN_FILE_TYPES = {
         'config.bin': 'config.cpp',
         'texHeaders.bin': 'texHeaders.hpp',
@@ -29,6 +66,9 @@ class PboExtractor:
         self.timeout = timeout
         self._temp_dirs: Dict[str, Path] = {}
         self._lock = threading.Lock()
+        # Keyed by (resolved path, mtime_ns, size) so a changed PBO is rescanned
+        self._list_cache: OrderedDict[Tuple[Path, int, int], tuple[int, str, str]] = OrderedDict()
+        self._scan_cache: OrderedDict[Tuple[Path, int, int], tuple[int, Dict[str, str], Set[str]]] = OrderedDict()
 
     def __del__(self) -> None:
         """Cleanup temporary resources"""
@@ -47,8 +87,8 @@ class PboExtractor:
         Args:
             operation_id: Unique identifier for this operation
         """
-        if operation_id is "":
-            operation_id = str(uuid.uuid4())
+        if not operation_id:
+            operation_id = os.urandom(16).hex()
             
         with self._lock:
             if operation_id not in self._temp_dirs:
@@ -67,15 +107,44 @@ class PboExtractor:
         """Alias for list_contents to maintain backwards compatibility"""
         return self.list_contents(pbo_path)
 
+    def _cached(self, cache: OrderedDict, pbo_path: Path, compute: Callable[[Path], Any]) -> Any:
+        """Return compute(pbo_path), reusing a successful result while the file is unchanged"""
+        try:
+            st = pbo_path.stat()
+        except OSError:
+            return compute(pbo_path)
+
+        key = (pbo_path.resolve(), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            result = cache.get(key)
+            if result is not None:
+                cache.move_to_end(key)
+                return result
+
+        result = compute(pbo_path)
+        if result[0] == 0:
+            with self._lock:
+                cache[key] = result
+                while len(cache) > self.SCAN_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return result
+
     def list_contents(self, pbo_path: Path) -> tuple[int, str, str]:
         """List contents of PBO file
-        
+
+        Successful listings are cached per file version, so listing an
+        unchanged PBO again does not run extractpbo.
+
         Args:
             pbo_path: Path to PBO file
             
         Returns:
             Tuple of (return_code, stdout, stderr)
         """
+        return self._cached(self._list_cache, pbo_path, self._run_list)
+
+    def _run_list(self, pbo_path: Path) -> tuple[int, str, str]:
+        """Run extractpbo to list a PBO's contents"""
         result = subprocess.run(
             ['extractpbo', '-LB', '-P', str(pbo_path)],
             capture_output=True,
@@ -83,10 +152,10 @@ class PboExtractor:
             timeout=self.timeout
         )
         
-        if result.stdout:
-            logger.debug(f"Raw PBO listing for {pbo_path.name}:")
+        if result.stdout and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw PBO listing for %s:", pbo_path.name)
             for line in result.stdout.splitlines():
-                logger.debug(f"  {line}")
+                logger.debug("  %s", line)
                 
         return result.returncode, result.stdout, result.stderr
 
@@ -120,7 +189,7 @@ class PboExtractor:
             cmd.append(f'-F={file_filter}')
         cmd.extend([str(pbo_path), str(output_dir)])
         
-        logger.debug(f"Running extractpbo command: {' '.join(cmd)}")
+        logger.debug("Running extractpbo command: %s", ' '.join(cmd))
         result = subprocess.run(
             cmd,
             capture_output=True,
@@ -139,7 +208,7 @@ class PboExtractor:
             try:
                 if new_name := self._detect_bin_type(bin_file.name):
                     new_path = bin_file.with_name(new_name)
-                    logger.debug(f"Renaming {bin_file.name} to {new_name}")
+                    logger.debug("Renaming %s to %s", bin_file.name, new_name)
                     bin_file.replace(new_path)
             except Exception as e:
                 logger.warning(f"Failed to process bin file {bin_file}: {e}")
@@ -153,14 +222,7 @@ class PboExtractor:
         Returns:
             Prefix string if found, None otherwise
         """
-        for line in stdout.splitlines():
-            if line.startswith('prefix='):
-                prefix = line.split('=', 1)[1].strip().strip(';')
-                return prefix.replace('\\', '/')
-            elif line.startswith('PboPrefix'):
-                prefix = line.split(':', 1)[1].strip().strip(';')
-                return prefix.replace('\\', '/')
-        return None
+        return _listing_prefix(stdout)
 
     def _read_file_with_fallback(self, file_path: Path) -> Optional[str]:
         """Try to read file with different encodings
@@ -179,12 +241,15 @@ class PboExtractor:
         """
         encodings = ['utf-8-sig', 'utf-8', 'cp1252', 'latin1']
         errors = []
+        # Read once and decode the bytes per encoding, rather than reopening
+        # and rereading the file for every attempt
+        data = file_path.read_bytes()
         
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                return content
+                content = data.decode(encoding)
+                # Match the universal newline handling of a text-mode read
+                return content.replace('\r\n', '\n').replace('\r', '\n')
             except UnicodeDecodeError as e:
                 errors.append(f"{encoding}: {str(e)}")
                 continue
@@ -219,8 +284,18 @@ class PboExtractor:
         return clean_path
 
     def scan_pbo_contents(self, pbo_path: Path) -> tuple[int, Dict[str, str], Set[str]]:
-        """Thread-safe scan of PBO contents"""
-        operation_id = str(uuid.uuid4())
+        """Thread-safe scan of PBO contents
+
+        Successful results are cached per file version, so scanning an
+        unchanged PBO again does not run extractpbo.
+        """
+        # Copies, so callers cannot modify the cached entry
+        returncode, code_files, all_paths = self._cached(self._scan_cache, pbo_path, self._scan_pbo_contents)
+        return returncode, dict(code_files), set(all_paths)
+
+    def _scan_pbo_contents(self, pbo_path: Path) -> tuple[int, Dict[str, str], Set[str]]:
+        """Scan PBO contents by running extractpbo"""
+        operation_id = os.urandom(16).hex()
         code_files: Dict[str, str] = {}
         all_paths: Set[str] = set()
         prefix = None
@@ -232,10 +307,9 @@ class PboExtractor:
                 return returncode, code_files, all_paths
                 
             prefix = self.extract_prefix(stdout)
-            logger.debug(f"Found PBO prefix: {prefix}")
-            logger.debug(f"Processing PBO: {pbo_path}")
-                
-            logger.debug("Found files:")
+            logger.debug("Found PBO prefix: %s", prefix)
+            logger.debug("Processing PBO: %s", pbo_path)
+
             for line in stdout.splitlines():
                 line = line.strip()
                 if not line or line.startswith(('Active code page:', 'Opening ', '==')):
@@ -244,18 +318,15 @@ class PboExtractor:
                 if line.startswith(('prefix=', 'Prefix=', '$')):
                     continue
 
-                logger.debug(f"  Raw path: {line}")                
                 clean_path = self._normalize_pbo_path(line, prefix)
                 if clean_path:
                     all_paths.add(clean_path)
                 
-            logger.debug(f"\nScan Results for {pbo_path.name}:")
-            logger.debug(f"  Prefix: {prefix}")
-            logger.debug(f"  Total paths found: {len(all_paths)}")
-            logger.debug(f"  Code files found: {len(code_files)}")
-            logger.debug("  Asset paths:")
-            for path in sorted(all_paths):
-                logger.debug(f"    {path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Scan results for %s: prefix %s, %d paths, %d code files\n  Asset paths: %s",
+                    pbo_path.name, prefix, len(all_paths), len(code_files), sorted(all_paths)
+                )
                         
             return returncode, code_files, all_paths
         finally:
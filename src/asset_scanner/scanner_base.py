@@ -4,7 +4,8 @@ from typing import List, Optional, Set, Callable, Dict, Tuple, Any
 from datetime import datetime
 import logging
 
-from .models import Asset, ScanResult
+from .file_walker import iter_files
+from .models import Asset, ScanResult, file_extension
 from .progress_callback import ProgressCallbackType
 from .scanner_tasks import ScanTask, TaskManager, TaskPriority
 
@@ -12,7 +13,7 @@ from .scanner_tasks import ScanTask, TaskManager, TaskPriority
 class BaseScanner(ABC):
     """Base class for asset scanners"""
 
-    ASSET_EXTENSIONS = {'.p3d', '.paa', '.rtm', '.jpg', '.jpeg', '.png', '.tga', '.wrp', '.pac', '.lip', '.rvmat', '.bin' }
+    ASSET_EXTENSIONS = frozenset({'.p3d', '.paa', '.rtm', '.jpg', '.jpeg', '.png', '.tga', '.wrp', '.pac', '.lip', '.rvmat', '.bin' })
 
     def __init__(
         self,
@@ -45,20 +46,18 @@ class BaseScanner(ABC):
         pbo_batch_size = 50
         pbo_batch = []
 
-        asset_ext_set = set(self.ASSET_EXTENSIONS)
+        asset_ext_set = self.ASSET_EXTENSIONS
 
-        all_files = list(path.rglob('*'))
+        for entry in iter_files(path):
+            item = Path(entry.path)
+            suffix = file_extension(entry.name)
 
-        for item in all_files:
-            if not item.is_file():
-                continue
-
-            if item.suffix == '.pbo':
+            if suffix == '.pbo':
                 pbo_batch.append(item)
                 if len(pbo_batch) >= pbo_batch_size:
                     self._process_pbo_batch(pbo_batch, source)
                     pbo_batch = []
-            elif item.suffix.lower() in asset_ext_set:
+            elif suffix in asset_ext_set:
                 self.task_manager.add_task(ScanTask(
                     path=item,
                     priority=TaskPriority.LOW,
@@ -239,8 +238,4 @@ class BaseScanner(ABC):
         if not path.exists():
             return []
 
-        pbo_files = []
-        for item in path.rglob("*.pbo"):
-            if item.is_file():
-                pbo_files.append(item)
-        return pbo_files
+        return [Path(entry.path) for entry in iter_files(path) if file_extension(entry.name) == '.pbo']
@@ -1,105 +1,121 @@
+import os
+import shutil
 import pytest
 import logging
-from pathlib import Path
+from pathlib import Path, PurePath
 from unittest.mock import Mock
-from typing import Dict, Set, Tuple, Any, List, TypedDict
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterator, Mapping, Set, Tuple, Any, List, TypedDict
+
+if TYPE_CHECKING:
+    # Imported inside the fixtures, so running a subset such as the cache tests
+    # does not load the scanner and extractor stack during collection
+    from asset_scanner import AssetAPI
+    from asset_scanner.pbo_extractor import PboExtractor
 
 class PboFileData(TypedDict):
     path: Path
     prefix: str
     source: str
-    expected: Set[str]
+    expected: FrozenSet[str]
 
 # Test Data Constants
-SAMPLE_DATA_ROOT = Path(__file__).parent.parent / "tests/test_data"
+SAMPLE_DATA_ROOT = PurePath(__file__).parent / "test_data"
+
+# Expected PBO contents, shared by PBO_FILES and the compatibility aliases
+MIRROR_EXPECTED: FrozenSet[str] = frozenset((
+    "config.bin",
+    "texHeaders.bin",
+    "logo.paa",
+    "logo_small.paa",
+    "uniform/mirror.p3d",
+    "uniform/black.paa",
+    "uniform/mirror.rvmat",
+))
+
+HEADBAND_EXPECTED: FrozenSet[str] = frozenset((
+    "config.bin",
+    "texHeaders.bin",
+    "data/tex/headband_choccymilk_co.paa",
+    "logo.paa",
+    "logo_small.paa",
+))
+
+EM_BABE_EXPECTED: FrozenSet[str] = frozenset((
+    'c_anm_EM/config.bin',
+    'c_gst/config.bin',
+    'c_ui/config.bin',
+    'config.bin',
+    'func/config.bin',
+    'texHeaders.bin',
+    'models/helper.p3d',
+    'data/nope_ca.paa',
+    'textures/EM_ca.paa',
+    'textures/ui/fatigue_ca.paa',
+    'animations/climbOnHer_pst.rtm',
+    'animations/climbOnHer_rfl.rtm',
+    'animations/climbOnHer_ua.rtm',
+    'animations/climbOnH_pst.rtm',
+    'animations/climbOnH_rfl.rtm',
+    'animations/climbOnH_ua.rtm',
+    'animations/climbOn_pst.rtm',
+    'animations/climbOn_rfl.rtm',
+    'animations/climbOn_ua.rtm',
+    'animations/climbOverHer_pst.rtm',
+    'animations/climbOverHer_rfl.rtm',
+    'animations/climbOverHer_ua.rtm',
+    'animations/climbOverH_pst.rtm',
+    'animations/climbOverH_rfl.rtm',
+    'animations/climbOverH_ua.rtm',
+    'animations/climbOver_pst.rtm',
+    'animations/climbOver_rfl.rtm',
+    'animations/climbOver_ua.rtm',
+    'animations/drop_pst.rtm',
+    'animations/drop_rfl.rtm',
+    'animations/drop_ua.rtm',
+    'animations/jump_pst.rtm',
+    'animations/jump_rfl.rtm',
+    'animations/jump_ua.rtm',
+    'animations/pull.rtm',
+    'animations/push.rtm',
+    'animations/stepOn_pst.rtm',
+    'animations/stepOn_rfl.rtm',
+    'animations/stepOn_ua.rtm',
+    'animations/vaultover_pst.rtm',
+    'animations/vaultover_rfl.rtm',
+    'animations/vaultover_ua.rtm',
+    'func/EH/fn_AnimDone.sqf',
+    'func/EH/fn_handledamage_nofd.sqf',
+    'func/core/fn_init.sqf',
+    'func/mov/fn_detect.sqf',
+    'func/mov/fn_detect_cl_only.sqf',
+    'func/mov/fn_em.sqf',
+    'func/mov/fn_exec_drop.sqf',
+    'func/mov/fn_exec_em.sqf',
+    'func/mov/fn_finish_drop.sqf',
+    'func/mov/fn_finish_em.sqf',
+    'func/mov/fn_jump.sqf',
+    'func/mov/fn_jump_only.sqf',
+    'func/mov/fn_walkonstuff.sqf',
+))
+
 PBO_FILES: Dict[str, PboFileData] = {
     'mirror': {
-        'path': SAMPLE_DATA_ROOT / '@tc_mirrorform/addons/mirrorform.pbo',
+        'path': Path(SAMPLE_DATA_ROOT, '@tc_mirrorform/addons/mirrorform.pbo'),
         'prefix': 'tc/mirrorform',
         'source': 'tc_mirrorform',
-        'expected': {
-            "config.bin",
-            "texHeaders.bin",
-            "logo.paa",
-            "logo_small.paa",
-            "uniform/mirror.p3d",
-            "uniform/black.paa",
-            "uniform/mirror.rvmat",
-        }
+        'expected': MIRROR_EXPECTED
     },
     'headband': {
-        'path': SAMPLE_DATA_ROOT / '@tc_rhs_headband/addons/rhs_headband.pbo',
+        'path': Path(SAMPLE_DATA_ROOT, '@tc_rhs_headband/addons/rhs_headband.pbo'),
         'prefix': 'tc/rhs_headband',
         'source': 'tc_rhs_headband',
-        'expected': {
-            "config.bin",
-            "texHeaders.bin",
-            "data/tex/headband_choccymilk_co.paa",
-            "logo.paa",
-            "logo_small.paa"
-        }
+        'expected': HEADBAND_EXPECTED
     },
     'em_babe': {
-        'path': SAMPLE_DATA_ROOT / '@em/addons/babe_em.pbo',
+        'path': Path(SAMPLE_DATA_ROOT, '@em/addons/babe_em.pbo'),
         'prefix': 'babe/babe_em',
         'source': 'em',
-        'expected': {
-            'c_anm_EM/config.bin',
-            'c_gst/config.bin',
-            'c_ui/config.bin',
-            'config.bin',
-            'func/config.bin',
-            'texHeaders.bin',
-            'models/helper.p3d',
-            'data/nope_ca.paa',
-            'textures/EM_ca.paa',
-            'textures/ui/fatigue_ca.paa',
-            'animations/climbOnHer_pst.rtm',
-            'animations/climbOnHer_rfl.rtm',
-            'animations/climbOnHer_ua.rtm',
-            'animations/climbOnH_pst.rtm',
-            'animations/climbOnH_rfl.rtm',
-            'animations/climbOnH_ua.rtm',
-            'animations/climbOn_pst.rtm',
-            'animations/climbOn_rfl.rtm',
-            'animations/climbOn_ua.rtm',
-            'animations/climbOverHer_pst.rtm',
-            'animations/climbOverHer_rfl.rtm',
-            'animations/climbOverHer_ua.rtm',
-            'animations/climbOverH_pst.rtm',
-            'animations/climbOverH_rfl.rtm',
-            'animations/climbOverH_ua.rtm',
-            'animations/climbOver_pst.rtm',
-            'animations/climbOver_rfl.rtm',
-            'animations/climbOver_ua.rtm',
-            'animations/drop_pst.rtm',
-            'animations/drop_rfl.rtm',
-            'animations/drop_ua.rtm',
-            'animations/jump_pst.rtm',
-            'animations/jump_rfl.rtm',
-            'animations/jump_ua.rtm',
-            'animations/pull.rtm',
-            'animations/push.rtm',
-            'animations/stepOn_pst.rtm',
-            'animations/stepOn_rfl.rtm',
-            'animations/stepOn_ua.rtm',
-            'animations/vaultover_pst.rtm',
-            'animations/vaultover_rfl.rtm',
-            'animations/vaultover_ua.rtm',
-            'func/EH/fn_AnimDone.sqf',
-            'func/EH/fn_handledamage_nofd.sqf',
-            'func/core/fn_init.sqf',
-            'func/mov/fn_detect.sqf',
-            'func/mov/fn_detect_cl_only.sqf',
-            'func/mov/fn_em.sqf',
-            'func/mov/fn_exec_drop.sqf',
-            'func/mov/fn_exec_em.sqf',
-            'func/mov/fn_finish_drop.sqf',
-            'func/mov/fn_finish_em.sqf',
-            'func/mov/fn_jump.sqf',
-            'func/mov/fn_jump_only.sqf',
-            'func/mov/fn_walkonstuff.sqf',
-        }
+        'expected': EM_BABE_EXPECTED
     }
 }
 
@@ -112,7 +128,8 @@ PBO_NAME_MAP = {
 
 # Update compatibility mappings
 PBO_PATHS = {k: PBO_FILES[PBO_NAME_MAP[k]]['path'] for k in PBO_NAME_MAP}
-EXPECTED_PATHS = {k: PBO_FILES[PBO_NAME_MAP[k]]['expected'] for k in PBO_NAME_MAP}
+# Shares the module-level frozensets, so nothing is rebuilt per test
+EXPECTED_PATHS: Dict[str, FrozenSet[str]] = {k: PBO_FILES[PBO_NAME_MAP[k]]['expected'] for k in PBO_NAME_MAP}
 SOURCE_MAPPING = {k: PBO_FILES[PBO_NAME_MAP[k]]['source'] for k in PBO_NAME_MAP}
 
 # Individual PBO files for backward compatibility
@@ -120,97 +137,171 @@ MIRRORFORM_PBO_FILE = PBO_FILES['mirror']['path']
 BABE_EM_PBO_FILE = PBO_FILES['em_babe']['path']
 HEADBAND_PBO_FILE = PBO_FILES['headband']['path']
 
-# Expected content sets for backward compatibility
-MIRROR_EXPECTED = PBO_FILES['mirror']['expected']
-EM_BABE_EXPECTED = PBO_FILES['em_babe']['expected']
-HEADBAND_EXPECTED = PBO_FILES['headband']['expected']
+# Checked once at import so per-PBO tests skip missing files without a stat each
+PBO_EXISTS = {name: Path(data['path']).exists() for name, data in PBO_FILES.items()}
+PBO_PARAMS = [
+    pytest.param(
+        name,
+        id=name,
+        marks=() if PBO_EXISTS[name] else pytest.mark.skip(reason=f"Missing PBO: {PBO_FILES[name]['path']}")
+    )
+    for name in PBO_FILES
+]
+
+def quick_write(path: Path, data: bytes = b"") -> None:
+    """Create or overwrite a small fixture file with raw os calls
+
+    Skips the io/codec layers of write_text and the extra utime of touch.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Hard link a read-only sample file into a fixture tree
+
+    The sample PBOs are megabytes each; a link shares the file data instead
+    of copying it. Falls back to a copy where links are not possible, such
+    as across filesystems.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def write_tree(root: Path, files: Mapping[str, bytes]) -> None:
+    """Create a fixture tree from root-relative paths to file contents
+
+    Each distinct parent directory is created once up front, shallowest
+    first so no mkdir has to walk back up to create its ancestors, and the
+    write loop does no per-file mkdir or existence checks.
+    """
+    paths = [root / rel for rel in files]
+    for parent in sorted({path.parent for path in paths}, key=lambda p: len(p.parts)):
+        parent.mkdir(parents=True, exist_ok=True)
+    for path, data in zip(paths, files.values()):
+        quick_write(path, data)
 
 # Basic Test Configuration
-@pytest.fixture(autouse=True)
-def setup_logging() -> None:
-    """Configure logging for tests"""
+def pytest_configure(config: pytest.Config) -> None:
+    """Configure logging and temp dirs once per session
+
+    Set ASSET_SCANNER_TEST_DEBUG to log at DEBUG level into test_debug.log,
+    and ASSET_SCANNER_TEST_TMPFS to keep tmp_path trees under /dev/shm.
+    """
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    level = logging.WARNING
+    if os.environ.get("ASSET_SCANNER_TEST_DEBUG"):
+        handlers.append(logging.FileHandler('test_debug.log'))
+        level = logging.DEBUG
+
     logging.basicConfig(
-        level=logging.DEBUG,
+        level=level,
         format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[logging.StreamHandler(), logging.FileHandler('test_debug.log')]
+        handlers=handlers
     )
 
+    # Opt-in: root pytest's numbered temp dirs on tmpfs. Only the root moves,
+    # so concurrent runs still get separate, rotated directories; an explicit
+    # --basetemp or PYTEST_DEBUG_TEMPROOT takes precedence.
+    if (os.environ.get("ASSET_SCANNER_TEST_TMPFS")
+            and config.option.basetemp is None
+            and "PYTEST_DEBUG_TEMPROOT" not in os.environ
+            and Path("/dev/shm").is_dir()):
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = "/dev/shm"
+
 # Sample Data Fixtures
 @pytest.fixture
-def sample_pbos() -> Dict[str, Tuple[Path, Set[str]]]:
+def sample_pbos() -> Dict[str, Tuple[Path, FrozenSet[str]]]:
     """Collection of sample PBO files with expected contents"""
     return {
-        str(name): (Path(data['path']), data['expected'])
+        name: (data['path'], data['expected'])
         for name, data in PBO_FILES.items()
     }
 
 @pytest.fixture
 def test_structure(tmp_path: Path) -> Path:
     """Create a test directory structure for all test types"""
-    mod_dir = tmp_path / "@test_mod"
-    mod_dir.mkdir()
-    addons_dir = mod_dir / "addons"
-    addons_dir.mkdir()
-
     # Create test files
-    test_files = {
-        "addons/config.pbo": "dummy",
-        "addons/data1.pbo": "dummy",
-        "addons/data2.pbo": "dummy",
-        "logo.paa": "dummy"
+    files = {
+        "@test_mod/addons/config.pbo": b"dummy",
+        "@test_mod/addons/data1.pbo": b"dummy",
+        "@test_mod/addons/data2.pbo": b"dummy",
+        "@test_mod/logo.paa": b"dummy"
     }
-    
-    for path, content in test_files.items():
-        full_path = mod_dir / path
-        full_path.parent.mkdir(exist_ok=True)
-        full_path.write_text(content)
 
     # Create performance test structure
     for i in range(100):
-        perf_dir = tmp_path / f"@mod_{i}"
-        perf_dir.mkdir()
         for j in range(10):
-            (perf_dir / f"file_{j}.p3d").write_text("test")
+            files[f"@mod_{i}/file_{j}.p3d"] = b""
 
+    write_tree(tmp_path, files)
     return tmp_path
 
 @pytest.fixture
 def mirror_addon_path(tmp_path: Path) -> Path:
     """Create mirror addon structure"""
     addon_path = tmp_path / "@tc_mirrorform"
-    addon_path.mkdir(parents=True, exist_ok=True)
     addons_dir = addon_path / "addons"
-    addons_dir.mkdir(exist_ok=True)
-    
-    for path_str in PBO_FILES['mirror']['expected']:
-        full_path = addons_dir / str(PBO_FILES['mirror']['prefix']) / str(path_str)
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_bytes(b"test data")
-    
+    addons_dir.mkdir(parents=True)
+
+    prefix = PBO_FILES['mirror']['prefix']
+    write_tree(addons_dir, {
+        f"{prefix}/{path_str}": b"test data"
+        for path_str in PBO_FILES['mirror']['expected']
+    })
     return addon_path
 
-@pytest.fixture
-def sample_data_path(tmp_path: Path) -> Path:
-    """Create complete sample data structure"""
-    sample_path = tmp_path / "sample_data"
-    sample_path.mkdir(exist_ok=True)
-    
+@pytest.fixture(scope="session")
+def sample_data_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create complete sample data structure, shared read-only across the session"""
+    sample_path = tmp_path_factory.mktemp("sample") / "sample_data"
+    files: Dict[str, bytes] = {}
+
     for name, data in PBO_FILES.items():
-        # Create addon structure
-        addon_name = f"@{data['source']}"  # Fix: use source instead of prefix split
-        addon_path = sample_path / addon_name
-        addon_path.mkdir(parents=True, exist_ok=True)
-        addons_dir = addon_path / "addons"
-        addons_dir.mkdir(exist_ok=True)
-        
-        # Create sample files
+        # Collect sample files; write_tree creates the addon directories
+        addons_dir = f"@{data['source']}/addons"  # Fix: use source instead of prefix split
         for filepath in data['expected']:
-            full_path = addons_dir / str(data['prefix']) / str(filepath)
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_bytes(b"test data")
-            
+            files[f"{addons_dir}/{data['prefix']}/{filepath}"] = b"test data"
+
+    write_tree(sample_path, files)
     return sample_path
 
+@pytest.fixture(scope="session")
+def complex_structure(tmp_path_factory: pytest.TempPathFactory) -> Tuple[Path, Path]:
+    """Create a complex nested mod structure, shared read-only across the session
+
+    Returns:
+        Tuple of (root directory, path of a known .p3d file inside it)
+    """
+    root = tmp_path_factory.mktemp("complex") / "complex_mods"
+
+    structure = {
+        "@mod_a": {
+            "addons/weapons/rifle.p3d": "rifle data",
+            "addons/weapons/rifle.paa": "rifle texture",
+            "addons/shared/common.paa": "shared texture 1",
+        },
+        "@mod_b": {
+            "addons/weapons/pistol.p3d": "pistol data",
+            "addons/shared/common.paa": "shared texture 2",
+        },
+        "@mod_c": {
+            "addons/weapons/rifle.paa": "different rifle texture",
+            "addons/unique/special.p3d": "unique model",
+        }
+    }
+
+    write_tree(root, {
+        f"{mod}/{path}": content.encode()
+        for mod, files in structure.items()
+        for path, content in files.items()
+    })
+
+    return root, root / "@mod_a/addons/weapons/rifle.p3d"
+
 # Mock Fixtures
 @pytest.fixture
 def mock_extractor() -> Mock:
@@ -264,4 +355,29 @@ from pathlib import Path
 @pytest.fixture
 def test_data_dir() -> Path:
     """Return the test data directory."""
-    return Path(__file__).parent / "test_data"
\ No newline at end of file
+    return Path(SAMPLE_DATA_ROOT)
+
+@pytest.fixture(scope="session")
+def pbo_extractor() -> 'PboExtractor':
+    """PboExtractor shared by the session, so its listing caches run extractpbo once per PBO"""
+    from asset_scanner.pbo_extractor import PboExtractor
+
+    return PboExtractor()
+
+@pytest.fixture(scope="session")
+def api_pool() -> Iterator[List['AssetAPI']]:
+    """Default-config APIs returned by finished tests, shut down with the session"""
+    pool: List['AssetAPI'] = []
+    yield pool
+    for instance in pool:
+        instance.shutdown()
+
+@pytest.fixture
+def api(api_pool: List['AssetAPI']) -> Iterator['AssetAPI']:
+    """Default-config AssetAPI, recycled between tests via AssetAPI.reset"""
+    from asset_scanner import AssetAPI
+
+    instance = api_pool.pop() if api_pool else AssetAPI()
+    instance.reset()
+    yield instance
+    api_pool.append(instance)
@@ -1,18 +1,25 @@
 import pytest
+import re
 from pathlib import Path
-from asset_scanner import Asset, AssetAPI
+from asset_scanner import Asset, AssetAPI, ScanResult
 from unittest.mock import Mock
 from asset_scanner.config import APIConfig
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Iterator, Tuple
 
-from tests.conftest import PBO_FILES
+from tests.conftest import PBO_EXISTS, PBO_FILES, link_or_copy, write_tree
 
+HEADBAND_PAA_RE = re.compile(r"headband.*\.paa$", re.IGNORECASE)
 
-@pytest.fixture
-def sample_assets(tmp_path: Path, test_data_dir: Path) -> Path:
-    """Create sample asset directory structure using real test data"""
-    asset_dir = tmp_path / "assets"
-    asset_dir.mkdir(parents=True)
+
+@pytest.fixture(scope="session")
+def sample_assets(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create sample asset directory structure using real test data
+
+    Built once per session; tests must treat it as read-only.
+    """
+    asset_dir = tmp_path_factory.mktemp("api") / "assets"
+    asset_dir.mkdir()
 
     # Copy real PBO files from test data
     for pbo_name, pbo_data in PBO_FILES.items():
@@ -21,23 +28,33 @@ def sample_assets(tmp_path: Path, test_data_dir: Path) -> Path:
         addon_dir = mod_dir / "addons"
         addon_dir.mkdir(parents=True, exist_ok=True)
 
-        # Copy the actual PBO file
+        # Link the actual PBO file, tests only read it
         src_pbo = pbo_data['path']
         dst_pbo = addon_dir / src_pbo.name
-        if src_pbo.exists():
-            dst_pbo.write_bytes(src_pbo.read_bytes())
+        if PBO_EXISTS[pbo_name]:
+            link_or_copy(src_pbo, dst_pbo)
 
     return asset_dir
 
 
-@pytest.fixture
-def api() -> AssetAPI:
-    return AssetAPI()
+@pytest.fixture(scope="session")
+def scanned_sample(sample_assets: Path) -> Iterator[Tuple[AssetAPI, ScanResult]]:
+    """API that has already scanned sample_assets, with the scan result, shared by read-only tests"""
+    api = AssetAPI()
+    result = api.scan(sample_assets)
+    yield api, result
+    api.shutdown()
 
 
-def test_basic_scanning(api: AssetAPI, sample_assets: Path) -> None:
+@pytest.fixture(scope="session")
+def scanned_api(scanned_sample: Tuple[AssetAPI, ScanResult]) -> AssetAPI:
+    """API that has already scanned sample_assets, shared by read-only tests"""
+    return scanned_sample[0]
+
+
+def test_basic_scanning(scanned_sample: Tuple[AssetAPI, ScanResult], sample_assets: Path) -> None:
     """Test basic asset scanning functionality"""
-    result = api.scan(sample_assets)
+    _, result = scanned_sample
     assert result.assets
     assert all(isinstance(asset, Asset) for asset in result.assets)
     assert result.source == sample_assets.name
@@ -57,10 +74,10 @@ def test_error_handling(api: AssetAPI) -> None:
     assert isinstance(args[0], FileNotFoundError)
 
 
-def test_asset_querying(api: AssetAPI, sample_assets: Path) -> None:
+def test_asset_querying(scanned_api: AssetAPI) -> None:
     """Test asset querying methods"""
-    api.scan(sample_assets)
-    
+    api = scanned_api
+
     # Test get_asset with known files from test data
     mirror_asset = api.get_asset("uniform/mirror.p3d")
     assert mirror_asset is not None
@@ -68,15 +85,98 @@ def test_asset_querying(api: AssetAPI, sample_assets: Path) -> None:
     
     # Test find_by_extension with known extensions
     p3d_assets = api.find_by_extension(".p3d")
-    assert len(p3d_assets) > 0
-    assert all(a.path.suffix == '.p3d' for a in p3d_assets)
+    assert {a.extension for a in p3d_assets} == {'.p3d'}
     
     # Test find_by_pattern with real file patterns
-    headband_assets = api.find_by_pattern(r"headband.*\.paa$")
+    headband_assets = api.find_by_pattern(HEADBAND_PAA_RE)
     assert len(headband_assets) > 0
     assert all('headband' in str(a.path) for a in headband_assets)
 
 
+def test_scan_multiple(api: AssetAPI, tmp_path: Path) -> None:
+    """Test scanning several mod directories concurrently"""
+    names = ("@mod1", "@mod2", "@mod3")
+    write_tree(tmp_path, {f"{name}/data/{name[1:]}.p3d": b"model data" for name in names})
+    mod_dirs = [tmp_path / name for name in names]
+
+    results = api.scan_multiple(mod_dirs)
+
+    assert [r.source for r in results] == ["mod1", "mod2", "mod3"]
+    assert all(len(r.assets) == 1 for r in results)
+    assert api.get_sources() == {"mod1", "mod2", "mod3"}
+    assert len(api.get_all_assets()) == 3
+
+    # A missing directory fails up front without scanning the others
+    api.clear_cache()
+    with pytest.raises(FileNotFoundError):
+        api.scan_multiple([mod_dirs[0], tmp_path / "@missing"])
+    assert len(api.get_all_assets()) == 0
+    api.shutdown()
+
+
+def test_scan_multiple_progress(tmp_path: Path) -> None:
+    """Test concurrent scans report only the fraction of directories finished"""
+    names = ("@mod1", "@mod2", "@mod3")
+    write_tree(tmp_path, {f"{name}/data/model_{i}.p3d": b"model data" for name in names for i in range(100)})
+
+    updates = []
+    api = AssetAPI(APIConfig(progress_callback=lambda msg, progress: updates.append(progress)))
+    try:
+        api.scan_multiple([tmp_path / name for name in names])
+    finally:
+        api.shutdown()
+
+    assert updates == [1 / 3, 2 / 3, 1.0]
+
+
+def test_rescan_reuses_assets(api: AssetAPI, tmp_path: Path) -> None:
+    """Test rescanning unchanged files returns the cached Asset objects"""
+    mod_dir = tmp_path / "@mod1"
+    mod_dir.mkdir()
+    (mod_dir / "vehicle.p3d").write_text("content1")
+    (mod_dir / "wheel.p3d").write_text("content2")
+
+    first = {a.normalized_path: a for a in api.scan(mod_dir).assets}
+    second = {a.normalized_path: a for a in api.scan(mod_dir).assets}
+
+    assert second.keys() == first.keys()
+    assert all(second[path] is first[path] for path in first)
+
+
+def test_reset(api: AssetAPI, tmp_path: Path) -> None:
+    """Test reset clears scan state but keeps the worker pools"""
+    for name in ("@mod1", "@mod2"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "model.p3d").write_text("model data")
+    api.scan_multiple([tmp_path / "@mod1", tmp_path / "@mod2"])
+    executor = api._executor
+    assert executor is not None
+
+    api.reset()
+    assert len(api.get_all_assets()) == 0
+    assert api._executor is executor
+    assert len(api.scan(tmp_path / "@mod1").assets) == 1
+
+
+def test_scan_cache_limit(tmp_path: Path) -> None:
+    """Test rescans replace a source's assets within the cache size limit"""
+    api = AssetAPI(APIConfig(max_cache_size=3))
+    write_tree(tmp_path, {
+        f"{name}/model{i}.p3d": name.encode()
+        for name in ("@mod1", "@mod2")
+        for i in range(2)
+    })
+
+    api.scan(tmp_path / "@mod1")
+    api.scan(tmp_path / "@mod1")
+    assert len(api.get_all_assets()) == 2
+
+    with pytest.raises(ValueError, match="Cache size exceeded"):
+        api.scan(tmp_path / "@mod2")
+    assert api.get_sources() == {"mod1"}
+    api.shutdown()
+
+
 def test_cache_persistence(api: AssetAPI, sample_assets: Path) -> None:
     """Test that cache persists between scans"""
     api.scan(sample_assets)
@@ -102,9 +202,9 @@ def test_cleanup(api: AssetAPI, sample_assets: Path) -> None:
     assert len(api.get_all_assets()) == 0
 
 
-def test_criteria_search(api: AssetAPI, sample_assets: Path) -> None:
+def test_criteria_search(scanned_api: AssetAPI) -> None:
     """Test finding assets by multiple criteria"""
-    api.scan(sample_assets)
+    api = scanned_api
     print("\nDebug - All scanned assets:")
     for asset in sorted(api.get_all_assets(), key=lambda x: str(x.path)):
         print(f"  {asset.source}: {asset.path}")
@@ -121,7 +221,7 @@ def test_criteria_search(api: AssetAPI, sample_assets: Path) -> None:
         print(f"  {asset.source}: {asset.path}")
     
     assert len(results) > 0, "Should find at least one .p3d file in uniform folder"
-    assert all(a.path.suffix == '.p3d' and 'uniform' in str(a.path) for a in results)
+    assert all(a.extension == '.p3d' and 'uniform' in str(a.path) for a in results)
     
     print("\nDebug - Testing PAA files in textures folder")
     criteria = {
@@ -135,7 +235,7 @@ def test_criteria_search(api: AssetAPI, sample_assets: Path) -> None:
         print(f"  {asset.source}: {asset.path}")
     
     assert len(results) > 0, "Should find at least one .paa file in textures folder"
-    assert all(a.path.suffix == '.paa' and 'textures' in str(a.path) for a in results)
+    assert all(a.extension == '.paa' and 'textures' in str(a.path) for a in results)
     
     print("\nDebug - Testing by source and extension")
     criteria = {
@@ -149,7 +249,7 @@ def test_criteria_search(api: AssetAPI, sample_assets: Path) -> None:
         print(f"  {asset.source}: {asset.path}")
     
     assert len(results) > 0, "Should find at least one .p3d file in assets"
-    assert all(a.path.suffix == '.p3d' and a.source == 'assets' for a in results)
+    assert all(a.extension == '.p3d' and a.source == 'assets' for a in results)
 
 
 def test_api_cache_persistence(tmp_path: Path) -> None:
@@ -177,6 +277,90 @@ def test_api_cache_persistence(tmp_path: Path) -> None:
         assert loaded == asset, f"Loaded asset {path} doesn't match original"
 
 
+def test_asset_iteration(api: AssetAPI) -> None:
+    """Test batched iteration over cached assets"""
+    assets = {
+        f"@test/file{i}.paa": Asset(path=Path(f"@test/file{i}.paa"), source="@test", last_scan=datetime.now())
+        for i in range(5)
+    }
+    api._cache.add_assets(assets)
+
+    batches = list(api.iter_assets(batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert {a for batch in batches for a in batch} == set(assets.values())
+
+    with pytest.raises(ValueError):
+        next(api.iter_assets(batch_size=0))
+
+
+@pytest.fixture(scope="module")
+def vehicle_api() -> Iterator[AssetAPI]:
+    """API holding a small vehicle asset tree, shared by read-only tests"""
+    api = AssetAPI()
+    now = datetime.now()
+    api._cache.add_assets({
+        path: Asset(path=Path(path), source="test", last_scan=now)
+        for path in ("test/models/vehicle.p3d", "test/models/wheel.p3d", "test/textures/vehicle_co.paa")
+    })
+    yield api
+    api.shutdown()
+
+
+def test_verification(vehicle_api: AssetAPI) -> None:
+    """Test batch verification of asset paths"""
+    api = vehicle_api
+
+    assert api.has_asset("test/models/vehicle.p3d")
+    assert api.has_asset("models/vehicle.p3d")
+    assert api.has_asset("TEXTURES\\VEHICLE_CO.PAA")
+    assert not api.has_asset("models/missing.p3d")
+
+    paths = ["models/vehicle.p3d", "vehicle_co.paa", "missing.paa"]
+    assert api.verify_assets(paths) == {
+        "models/vehicle.p3d": True,
+        "vehicle_co.paa": True,
+        "missing.paa": False
+    }
+    assert api.find_missing(paths) == {"missing.paa"}
+
+
+def test_asset_tree(vehicle_api: AssetAPI) -> None:
+    """Test grouping assets by directory and finding related assets"""
+    api = vehicle_api
+    vehicle = api.get_asset("test/models/vehicle.p3d")
+    wheel = api.get_asset("test/models/wheel.p3d")
+    texture = api.get_asset("test/textures/vehicle_co.paa")
+
+    tree = api.get_asset_tree()
+    assert set(tree) == {"test/models", "test/textures"}
+    assert tree["test/models"] == {vehicle, wheel}
+
+    assert api.find_related(vehicle) == {wheel}
+    assert api.find_related(texture) == set()
+
+    # The tree is a frozen snapshot; callers cannot reach the live index
+    assert isinstance(tree["test/models"], frozenset)
+    assert api.get_asset_tree() is tree
+
+
+def test_criteria_combinations(api: AssetAPI) -> None:
+    """Test combined criteria without scanning PBOs"""
+    assets = [
+        Asset(path=Path("a/uniform/mirror.p3d"), source="a", last_scan=datetime.now()),
+        Asset(path=Path("a/uniform/mirror.paa"), source="a", last_scan=datetime.now()),
+        Asset(path=Path("b/uniform/other.p3d"), source="b", last_scan=datetime.now())
+    ]
+    api._cache.add_assets({a.path_str: a for a in assets})
+
+    assert api.find_by_criteria({'extension': '.p3d', 'pattern': 'uniform/'}) == {assets[0], assets[2]}
+    assert api.find_by_criteria({'extension': '.p3d', 'source': 'a'}) == {assets[0]}
+    assert api.find_by_criteria({'pattern': 'mirror', 'source': 'a'}) == {assets[0], assets[1]}
+    assert api.find_by_criteria({}) == set(assets)
+
+    assert api.find_by_patterns([r"mirror\.p3d$", r"other"]) == {assets[0], assets[2]}
+    assert api.find_by_patterns([]) == set()
+
+
 def test_api_cache_invalidation(api: AssetAPI, sample_assets: Path) -> None:
     """Test cache invalidation behavior"""
     # Initial scan
@@ -184,7 +368,7 @@ def test_api_cache_invalidation(api: AssetAPI, sample_assets: Path) -> None:
     assert api.is_cache_valid()
     
     # Force cache to be old
-    api._cache._last_updated = datetime.now() - timedelta(hours=2)
+    api._cache._last_updated_ns -= 2 * 3600 * 1_000_000_000
     assert not api.is_cache_valid()
     
     # Verify rescan updates cache
@@ -1,31 +1,43 @@
 import pytest
 import logging
+import re
 from pathlib import Path
+from typing import Iterator, Tuple
 from pytest import LogCaptureFixture
 
-from asset_scanner import AssetAPI
+from asset_scanner import AssetAPI, ScanResult
 from .conftest import PBO_FILES, MIRRORFORM_PBO_FILE
 
 logger = logging.getLogger(__name__)
 
-def test_scanning_all_addons(sample_data_path: Path, tmp_path: Path) -> None:
-    """Test scanning all sample addons together"""
+# Compiled once; find_by_pattern uses compiled patterns as given
+MIRROR_RE = re.compile(r".*mirror.*", re.IGNORECASE)
+HEADBAND_RE = re.compile(r".*headband.*", re.IGNORECASE)
+
+@pytest.fixture(scope="module")
+def scanned_data(sample_data_path: Path) -> Iterator[Tuple[AssetAPI, ScanResult]]:
+    """API that has scanned sample_data_path once, with its result, shared by read-only tests"""
     api = AssetAPI()
     result = api.scan(sample_data_path)
+    yield api, result
+    api.shutdown()
+
+def test_scanning_all_addons(scanned_data: Tuple[AssetAPI, ScanResult], sample_data_path: Path) -> None:
+    """Test scanning all sample addons together"""
+    _, result = scanned_data
     
     assert result.assets, "Should find assets"
     assert result.source == sample_data_path.name
 
     logger.debug("Scan results:")
-    logger.debug(f"  Source: {result.source}")
-    logger.debug(f"  Assets: {len(result.assets)}")
-    logger.debug(f"  Files: {[str(a.path) for a in result.assets]}")
+    logger.debug("  Source: %s", result.source)
+    logger.debug("  Assets: %d", len(result.assets))
+    logger.debug("  Files: %s", sorted(a.path_str for a in result.assets))
 
 
-def test_asset_patterns(sample_data_path: Path, tmp_path: Path) -> None:
+def test_asset_patterns(scanned_data: Tuple[AssetAPI, ScanResult]) -> None:
     """Test pattern-based asset filtering"""
-    api = AssetAPI()
-    api.scan(sample_data_path)
+    api, _ = scanned_data
 
     models = api.find_by_extension('.p3d')
     textures = api.find_by_extension('.paa')
@@ -34,8 +46,8 @@ def test_asset_patterns(sample_data_path: Path, tmp_path: Path) -> None:
     assert len(textures) > 0, "Should find texture files"
 
     # Test specific patterns
-    mirror = api.find_by_pattern(r".*mirror.*")
-    headband = api.find_by_pattern(r".*headband.*")
+    mirror = api.find_by_pattern(MIRROR_RE)
+    headband = api.find_by_pattern(HEADBAND_RE)
 
     assert len(mirror) > 0, "Should find mirror assets"
     assert len(headband) > 0, "Should find headband assets"
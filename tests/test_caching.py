@@ -3,12 +3,18 @@ import pytest
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
+import pickle
+import os
+import re
+import subprocess
+import sys
+from asset_scanner import cache as cache_module
 from asset_scanner.cache import AssetCache
 from asset_scanner.models import Asset
 
-@pytest.fixture
-def sample_assets(tmp_path: Path) -> dict[str, Asset]:
-    """Create sample assets for testing"""
+@pytest.fixture(scope="module")
+def sample_assets() -> dict[str, Asset]:
+    """Create sample assets for testing, shared by the module (assets are frozen)"""
     now = datetime.now()
     return {
         "asset1": Asset(
@@ -33,7 +39,7 @@ def test_cache_basic_operations(sample_assets: dict[str, Asset]) -> None:
     cache = AssetCache()
     
     # Test adding assets
-    cache.add_assets({str(a.path): a for a in sample_assets.values()})
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
     assert len(cache.get_all_assets()) == len(sample_assets)
     
     # Test retrieving specific asset
@@ -50,7 +56,7 @@ def test_cache_persistence(tmp_path: Path, sample_assets: dict[str, Asset]) -> N
     cache = AssetCache()
     
     # Add and save assets
-    cache.add_assets({str(a.path): a for a in sample_assets.values()})
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
     cache.save_to_disk(cache_file)
     
     # Load in new cache instance
@@ -59,13 +65,261 @@ def test_cache_persistence(tmp_path: Path, sample_assets: dict[str, Asset]) -> N
     
     # Verify loaded assets match original
     for asset in sample_assets.values():
-        loaded = new_cache.get_asset(str(asset.path))
+        loaded = new_cache.get_asset(asset.path_str)
         assert loaded == asset
 
+def test_cache_json_backends(tmp_path: Path, sample_assets: dict[str, Asset], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test JSON caches written with and without orjson load with either"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+    with_orjson = tmp_path / "orjson.json"
+    cache.save_to_disk(with_orjson)
+
+    monkeypatch.setattr(cache_module, "orjson", None)
+    plain = tmp_path / "plain.json"
+    cache.save_to_disk(plain)
+    assert AssetCache.load_from_disk(with_orjson).get_all_assets() == cache.get_all_assets()
+    monkeypatch.undo()
+
+    assert AssetCache.load_from_disk(plain).get_all_assets() == cache.get_all_assets()
+
+def test_cache_stream_to_disk(tmp_path: Path, sample_assets: dict[str, Asset]) -> None:
+    """Test a streamed cache file is valid JSON that loads back"""
+    cache_file = tmp_path / "streamed.json"
+    AssetCache().stream_to_disk(cache_file)
+    assert json.loads(cache_file.read_text())["assets"] == {}
+
+    cache = AssetCache(max_cache_size=10)
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+    cache.stream_to_disk(cache_file)
+    assert json.loads(cache_file.read_text()) == json.loads(json.dumps(cache.to_serializable()))
+
+    loaded = AssetCache.load_from_disk(cache_file)
+    assert loaded.get_all_assets() == cache.get_all_assets()
+    assert loaded.max_cache_size == 10
+
+def test_cache_load_shares_parsed_fields(tmp_path: Path) -> None:
+    """Test loaded assets share one parsed scan time and PBO path"""
+    now = datetime.now()
+    cache = AssetCache()
+    cache.add_assets({
+        f"@mod1/addons/model{i}.p3d": Asset(
+            path=Path(f"@mod1/addons/model{i}.p3d"),
+            source="@mod1",
+            last_scan=now,
+            pbo_path=Path("@mod1/addons/models.pbo")
+        )
+        for i in range(3)
+    })
+    cache_file = tmp_path / "cache.json"
+    cache.save_to_disk(cache_file)
+
+    loaded = AssetCache.load_from_disk(cache_file).get_all_assets()
+    assert loaded == cache.get_all_assets()
+    assert len({id(a.last_scan) for a in loaded}) == 1
+    assert len({id(a.pbo_path) for a in loaded}) == 1
+
+def test_cache_snapshot_reuse(sample_assets: dict[str, Asset]) -> None:
+    """Test that the all-assets snapshot is reused until the cache changes"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+
+    first = cache.get_all_assets()
+    assert cache.get_all_assets() is first
+
+    extra = Asset(path=Path("@mod3/addons/extra.paa"), source="@mod3", last_scan=datetime.now())
+    cache.add_assets({str(extra.path): extra})
+    assert extra in cache.get_all_assets()
+    assert extra not in first
+
+    cache.clear()
+    assert len(cache.get_all_assets()) == 0
+
+def test_cache_pattern_search(sample_assets: dict[str, Asset]) -> None:
+    """Test pattern searches skip the @source component and see new assets"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+
+    assert cache.find_by_pattern(re.compile(r"^addons/weapon1")) == {sample_assets["asset1"]}
+    assert cache.find_by_pattern(re.compile(r"mod1")) == set()
+
+    extra = Asset(path=Path("@mod3/addons/weapon3.p3d"), source="@mod3", last_scan=datetime.now())
+    cache.add_assets({str(extra.path): extra})
+    assert extra in cache.find_by_pattern(re.compile(r"weapon\d\.p3d$"))
+
+    # Plain-text search matches the equivalent case-insensitive regex
+    assert cache.find_by_text("WEAPON") == cache.find_by_pattern(re.compile("weapon", re.IGNORECASE))
+    assert cache.find_by_text("mod1") == set()
+    kelvin = Asset(path=Path("@mod3/addons/\u212aelvin.paa"), source="@mod3", last_scan=datetime.now())
+    cache.add_assets({kelvin.path_str: kelvin})
+    assert cache.find_by_text("kelvin") == {kelvin}
+
+def test_cache_lookup_indexes(sample_assets: dict[str, Asset]) -> None:
+    """Test case-insensitive and filename lookups stay in step with updates"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+
+    assert cache.get_asset("@MOD1/ADDONS/WEAPON1.P3D", case_sensitive=False) == sample_assets["asset1"]
+    assert cache.get_asset("@MOD1/ADDONS/WEAPON1.P3D") is None
+    assert cache.get_asset_by_filename("weapon2.p3d") == sample_assets["asset3"]
+    assert cache.get_asset_by_filename("WEAPON2.P3D") is None
+    assert cache.get_asset_by_filename("WEAPON2.P3D", case_sensitive=False) == sample_assets["asset3"]
+
+    # Replacing an entry must not leave the old asset reachable
+    replacement = Asset(path=Path("@mod2/addons/weapon2.p3d"), source="@mod2", last_scan=datetime.now() + timedelta(seconds=1))
+    cache.add_assets({str(replacement.path): replacement})
+    assert cache.get_asset("@mod2/addons/WEAPON2.p3d", case_sensitive=False) is replacement
+    assert cache.get_asset_by_filename("weapon2.p3d") is replacement
+
+    # Paths below a source resolve without the source component
+    scanned = Asset(path=Path("mod1/data/Gun.p3d"), source="mod1", last_scan=datetime.now())
+    cache.add_assets({scanned.path_str: scanned})
+    assert cache.get_asset_in_sources("data/gun.p3d", case_sensitive=False) is scanned
+    assert cache.get_asset_in_sources("data/gun.p3d") is None
+    assert cache.get_asset_in_sources("addons/weapon1.p3d") is None  # "@mod1" is not a source
+
+    # Sources come from the index and drop out once their last asset moves
+    assert cache.get_sources() == {"mod1", "mod2"}
+    sources = cache.get_sources_frozen()
+    assert sources == {"mod1", "mod2"} and cache.get_sources_frozen() is sources
+    moved = Asset(path=Path("@mod2/addons/weapon2.p3d"), source="@mod3", last_scan=datetime.now())
+    cache.add_assets({str(moved.path): moved})
+    assert cache.get_sources() == {"mod1", "mod3"}
+    assert cache.get_sources_frozen() == {"mod1", "mod3"}
+    assert cache.count_by_source("@mod3") == 1 and cache.count_by_source("mod2") == 0
+
+def test_asset_path_normalization() -> None:
+    """Test separators are normalized and clean paths are not rebuilt"""
+    now = datetime.now()
+    windows = Asset(path="\\mod1\\data\\a.p3d", source="mod1", last_scan=now, pbo_path=Path("addons/"))
+    assert windows.path == Path("mod1/data/a.p3d")
+    assert windows.normalized_path == "mod1/data/a.p3d"
+    assert windows.path_str == str(windows.path)
+    assert windows.pbo_path == Path("addons")
+
+    assert windows.parent_path == "mod1/data"
+    assert Asset(path=Path("a.p3d"), source="mod1", last_scan=now).parent_path == Path("a.p3d").parent.as_posix()
+
+    clean = Path("mod1/data/a.p3d")
+    assert Asset(path=clean, source="mod1", last_scan=now).path is clean
+
+def test_cache_interned_keys() -> None:
+    """Test sources, extensions and directory keys share one string object per value"""
+    now = datetime.now()
+    first = Asset(path=Path("@mod1/data/a.p3d"), source="".join(["@", "mod1"]), last_scan=now)
+    second = Asset(path=Path("@mod1/data/b.p3d"), source="".join(["mod", "1"]), last_scan=now)
+    assert first.source is second.source
+    assert first.extension == ".p3d" and first.extension is second.extension
+    # Unpickling must re-intern even where dataclass replaces __setstate__ (3.10)
+    restored = pickle.loads(pickle.dumps(first))
+    assert restored.source is first.source
+    assert restored.extension is first.extension
+
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in (first, second)})
+    parent = next(iter(cache.get_asset_tree()))
+    assert parent is sys.intern("".join(["@mod1/", "data"]))
+
+def test_cache_asset_tree_snapshot(sample_assets: dict[str, Asset]) -> None:
+    """Test the asset tree is frozen and only rebuilt after a change"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+    tree = cache.get_asset_tree()
+    mod2 = tree["@mod2/addons"]
+    assert tree["@mod1/addons"] == {sample_assets["asset1"], sample_assets["asset2"]}
+    assert cache.get_asset_tree() is tree
+
+    extra = Asset(path=Path("@mod1/addons/extra.p3d"), source="@mod1", last_scan=datetime.now())
+    cache.add_assets({extra.path_str: extra})
+    updated = cache.get_asset_tree()
+    assert extra not in tree["@mod1/addons"]
+    assert extra in updated["@mod1/addons"]
+    # Unchanged directories keep their frozen view
+    assert updated["@mod2/addons"] is mod2
+
+def test_cache_content_duplicates(tmp_path: Path) -> None:
+    """Test identical-content assets are grouped and survive persistence"""
+    now = datetime.now()
+    vehicle = Asset(path=Path("@mod1/data/vehicle.p3d"), source="@mod1", last_scan=now, content_hash="aa")
+    copy = Asset(path=Path("@mod2/other/vehicle_copy.p3d"), source="@mod2", last_scan=now, content_hash="aa")
+    other = Asset(path=Path("@mod1/data/other.p3d"), source="@mod1", last_scan=now, content_hash="bb")
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in (vehicle, copy, other)})
+
+    assert cache.find_content_duplicates() == {"aa": {vehicle, copy}}
+    assert cache.find_related(vehicle) == {other}
+    assert cache.find_related(vehicle, include_duplicates=True) == {other, copy}
+
+    cache_file = tmp_path / "cache.json"
+    cache.save_to_disk(cache_file)
+    assert AssetCache.load_from_disk(cache_file).find_content_duplicates() == {"aa": {vehicle, copy}}
+
+    # Rescanned contents move the asset out of its old group
+    changed = Asset(path=copy.path, source="@mod2", last_scan=now, content_hash="cc")
+    cache.add_assets({str(changed.path): changed})
+    assert cache.find_content_duplicates() == {}
+
+def test_cache_pickle_persistence(tmp_path: Path, sample_assets: dict[str, Asset]) -> None:
+    """Test cache save/load using the pickle format"""
+    cache_file = tmp_path / "test_cache.pkl"
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+    cache.save_to_disk(cache_file)
+
+    new_cache = AssetCache.load_from_disk(cache_file)
+    assert new_cache.get_all_assets() == cache.get_all_assets()
+    assert new_cache.get_assets_by_source("@mod1") == cache.get_assets_by_source("@mod1")
+
+    cache_file.write_bytes(b"not a pickle")
+    assert len(AssetCache.load_from_disk(cache_file).get_all_assets()) == 0
+
+_LOAD_IN_SUBPROCESS = """
+import sys
+from datetime import datetime
+from pathlib import Path
+from asset_scanner.cache import AssetCache
+from asset_scanner.models import Asset
+
+cache = AssetCache.load_from_disk(Path(sys.argv[1]))
+probe = Asset(path=Path(sys.argv[2]), source=sys.argv[3], last_scan=datetime.fromisoformat(sys.argv[4]))
+print(len(cache.get_all_assets()))
+print(probe in cache.get_assets_by_source(sys.argv[3]))
+print(probe in cache.get_assets_by_extension(probe.extension))
+"""
+
+def test_cache_pickle_cross_process(tmp_path: Path, sample_assets: dict[str, Asset]) -> None:
+    """Test a pickle cache loaded by another interpreter answers source and extension queries"""
+    cache_file = tmp_path / "test_cache.pkl"
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+    cache.save_to_disk(cache_file)
+
+    probe = sample_assets["asset1"]
+    # A different hash seed makes any hash restored from the pickle stale
+    env = {**os.environ, "PYTHONHASHSEED": "12345",
+           "PYTHONPATH": str(Path(cache_module.__file__).parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-c", _LOAD_IN_SUBPROCESS, str(cache_file),
+         probe.path_str, probe.source, probe.last_scan.isoformat()],
+        env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == [str(len(sample_assets)), "True", "True"]
+
+def test_asset_hash_after_unpickle(sample_assets: dict[str, Asset]) -> None:
+    """Test the cached hash is recomputed rather than restored from a pickle"""
+    asset = sample_assets["asset1"]
+    restore, (state,) = asset.__reduce__()
+    assert asset._hash not in state
+
+    restored = restore(state)
+    assert restored == asset and hash(restored) == hash(asset)
+    assert restored in {asset}
+    assert pickle.loads(pickle.dumps(asset)) in {asset}
+
 def test_cache_source_isolation(sample_assets: dict[str, Asset]) -> None:
     """Test asset source separation"""
     cache = AssetCache()
-    cache.add_assets({str(a.path): a for a in sample_assets.values()})
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
     
     mod1_assets = cache.get_assets_by_source("@mod1")
     mod2_assets = cache.get_assets_by_source("@mod2")
@@ -74,15 +328,52 @@ def test_cache_source_isolation(sample_assets: dict[str, Asset]) -> None:
     assert len(mod2_assets) == 1
     assert not mod1_assets.intersection(mod2_assets)
 
+    # Adding to one source leaves other sources' results in place
+    extra = Asset(path=Path("@mod1/addons/extra.paa"), source="@mod1", last_scan=datetime.now())
+    cache.add_assets({extra.path_str: extra})
+    assert cache.get_assets_by_source("@mod2") is mod2_assets
+    assert cache.get_assets_by_source("@mod1") == mod1_assets | {extra}
+
+def test_cache_extension_lookup(sample_assets: dict[str, Asset]) -> None:
+    """Test asset lookup by extension"""
+    cache = AssetCache()
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
+
+    assert cache.get_assets_by_extension(".p3d") == {sample_assets["asset1"], sample_assets["asset3"]}
+    assert cache.get_assets_by_extension("PAA") == {sample_assets["asset2"]}
+    assert cache.get_assets_by_extension(".rtm") == set()
+
+    # Repeat queries reuse the same frozen result until the cache changes
+    p3d = cache.get_assets_by_extension("p3d")
+    assert isinstance(p3d, frozenset)
+    assert cache.get_assets_by_extension(".P3D") is p3d
+    assert cache.get_assets_by_source("mod1") is cache.get_assets_by_source("@mod1")
+
+    cache.clear()
+    assert cache.get_assets_by_extension(".p3d") == set()
+    assert cache.get_assets_by_source("@mod1") == set()
+
 def test_cache_validity() -> None:
     """Test cache validity timing"""
     cache = AssetCache()
     assert cache.is_valid()
     
     # Force cache to be old
-    cache._last_updated = datetime.now() - timedelta(hours=2)
+    cache._last_updated_ns -= 2 * 3600 * 1_000_000_000
     assert not cache.is_valid()
 
+def test_cache_validity_persisted(tmp_path: Path) -> None:
+    """Test cache age survives a save and load"""
+    cache = AssetCache()
+    fresh_file = tmp_path / "fresh.json"
+    cache.save_to_disk(fresh_file)
+    assert AssetCache.load_from_disk(fresh_file).is_valid()
+
+    cache._last_updated_ns -= 2 * 3600 * 1_000_000_000
+    stale_file = tmp_path / "stale.json"
+    cache.save_to_disk(stale_file)
+    assert not AssetCache.load_from_disk(stale_file).is_valid()
+
 def test_cache_size_limit() -> None:
     """Test cache size limitations"""
     cache = AssetCache(max_cache_size=2)
@@ -95,7 +386,17 @@ def test_cache_size_limit() -> None:
     }
     
     with pytest.raises(ValueError, match="Cache size exceeded"):
-        cache.add_assets({str(a.path): a for a in assets.values()})
+        cache.add_assets({a.path_str: a for a in assets.values()})
+    assert len(cache) == 0
+
+    # The limit counts what is already cached, but replacements add nothing
+    first, second, third = assets.values()
+    cache.add_assets({first.path_str: first})
+    with pytest.raises(ValueError, match="Cache size exceeded: 3 > 2"):
+        cache.add_assets({a.path_str: a for a in (second, third)})
+    assert cache.get_all_assets() == {first}
+    cache.add_assets({a.path_str: a for a in (first, second)})
+    assert len(cache) == 2
 
 def test_cache_duplicate_detection(sample_assets: dict[str, Asset]) -> None:
     """Test finding duplicate assets"""
@@ -109,11 +410,15 @@ def test_cache_duplicate_detection(sample_assets: dict[str, Asset]) -> None:
         last_scan=datetime.now()
     )
     
-    cache.add_assets({str(a.path): a for a in assets.values()})
+    cache.add_assets({a.path_str: a for a in assets.values()})
     duplicates = cache.find_duplicates()
     
-    assert "weapon1.p3d" in duplicates
-    assert len(duplicates["weapon1.p3d"]) == 2
+    assert duplicates == {"weapon1.p3d": {sample_assets["asset1"], assets["duplicate"]}}
+
+    # Names differing only in case are not duplicates
+    upper = Asset(path=Path("@mod4/addons/WEAPON1.p3d"), source="@mod4", last_scan=datetime.now())
+    cache.add_assets({upper.path_str: upper})
+    assert cache.find_duplicates() == duplicates
 
 def test_cache_invalid_file(tmp_path: Path) -> None:
     """Test handling of corrupted cache file"""
@@ -126,7 +431,7 @@ def test_cache_invalid_file(tmp_path: Path) -> None:
 def test_cache_serialization(sample_assets: dict[str, Asset]) -> None:
     """Test cache serialization format"""
     cache = AssetCache()
-    cache.add_assets({str(a.path): a for a in sample_assets.values()})
+    cache.add_assets({a.path_str: a for a in sample_assets.values()})
     
     data = cache.to_serializable()
     
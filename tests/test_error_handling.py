@@ -6,24 +6,6 @@ from unittest.mock import Mock
 from asset_scanner.config import APIConfig
 
 
-@pytest.fixture
-def api() -> AssetAPI:
-    """Create API instance for testing"""
-    return AssetAPI()
-
-
-@pytest.fixture
-def edge_case_structure(tmp_path: Path) -> Path:
-    """Create error-triggering file structure"""
-    base = tmp_path / "error_test"
-    base.mkdir()
-
-    (base / "bad.p3d").write_bytes(b'\x00\xFF' * 1000)
-    (base / ".invalid").write_text("invalid content")
-
-    return base
-
-
 def test_error_handler() -> None:
     """Test error handler configuration"""
     error_handler = Mock()
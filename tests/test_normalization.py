@@ -1,38 +1,34 @@
+import pytest
 from pathlib import Path
+from typing import Iterator
 from asset_scanner import Asset, AssetAPI
 from datetime import datetime
 
-def test_asset_path_normalization() -> None:
+@pytest.mark.parametrize("path", [
+    r"test\path\file.paa",
+    "test/path/file.paa",
+    "/test/path/file.paa",
+    "test/path/file.paa/",
+    "//test//path//file.paa"
+])
+def test_asset_path_normalization(path: str) -> None:
     """Test that Asset enforces path normalization"""
-    paths = [
-        r"test\path\file.paa",
-        "test/path/file.paa",
-        "/test/path/file.paa",
-        "test/path/file.paa/",
-        "//test//path//file.paa"
-    ]
-    
-    expected = "test/path/file.paa"
-    
-    for path in paths:
-        asset = Asset(
-            path=Path(path),
-            source="test",
-            last_scan=datetime.now()
-        )
-        assert asset.normalized_path == expected
+    asset = Asset(
+        path=Path(path),
+        source="test",
+        last_scan=datetime.now()
+    )
+    assert asset.normalized_path == "test/path/file.paa"
 
-def test_source_normalization() -> None:
+@pytest.mark.parametrize("source", ["test", "@test", "@@test"])
+def test_source_normalization(source: str) -> None:
     """Test that @ prefix is stripped from source"""
-    sources = ["test", "@test", "@@test"]
-    
-    for source in sources:
-        asset = Asset(
-            path=Path("test.paa"),
-            source=source,
-            last_scan=datetime.now()
-        )
-        assert asset.source == "test"
+    asset = Asset(
+        path=Path("test.paa"),
+        source=source,
+        last_scan=datetime.now()
+    )
+    assert asset.source == "test"
 
 def test_pbo_path_normalization() -> None:
     """Test PBO path normalization"""
@@ -42,41 +38,37 @@ def test_pbo_path_normalization() -> None:
         last_scan=datetime.now(),
         pbo_path=Path("test\\addon.pbo")
     )
-    assert str(asset.pbo_path).replace('\\', '/') == "test/addon.pbo"
+    assert asset.pbo_path.as_posix() == "test/addon.pbo"
 
-def test_api_path_handling(tmp_path) -> None:
-    """Test API handles different path formats consistently"""
+@pytest.fixture(scope="module")
+def scanned_mod_api(tmp_path_factory: pytest.TempPathFactory) -> Iterator[AssetAPI]:
+    """API that has scanned a one-file mod, shared by the path variant tests"""
     api = AssetAPI()
-    
+
     # Create test structure
-    mod_dir = tmp_path / "test_mod"
+    mod_dir = tmp_path_factory.mktemp("normalization") / "test_mod"
     mod_dir.mkdir()
     (mod_dir / "test.paa").write_text("content")
-    
+
     api.scan(mod_dir)
-    
-    # Different ways to reference the same file
-    paths = [
-        "test.paa",                    # Just filename
-        "./test.paa",                  # Current directory
-        "test_mod/test.paa",          # With source
-        "test_mod\\test.paa",         # Windows path
-        "/test_mod/test.paa",         # Absolute-style
-        ".\\test.paa",                # Windows current dir
-    ]
-    
-    # Debug output
-    print("\nDebug: Scanned assets:")
-    for asset in api.get_all_assets():
-        print(f"  {asset.path} (source: {asset.source})")
-    
-    # Get reference asset
-    first_result = api.get_asset(paths[0])
+    yield api
+    api.shutdown()
+
+# Different ways to reference the same file
+@pytest.mark.parametrize("path", [
+    "./test.paa",                  # Current directory
+    "test_mod/test.paa",          # With source
+    "test_mod\\test.paa",         # Windows path
+    "/test_mod/test.paa",         # Absolute-style
+    ".\\test.paa",                # Windows current dir
+])
+def test_api_path_handling(scanned_mod_api: AssetAPI, path: str) -> None:
+    """Test API handles different path formats consistently"""
+    # Get reference asset by just the filename
+    first_result = scanned_mod_api.get_asset("test.paa")
     assert first_result is not None, "Failed to find reference asset"
-    
-    # Test each path variant
-    for path in paths[1:]:
-        result = api.get_asset(path)
-        assert result is not None, f"Failed to find asset with path: {path}"
-        assert result == first_result, f"Mismatch for path: {path}"
-        assert str(result.path).replace('\\', '/') == str(first_result.path).replace('\\', '/')
+
+    result = scanned_mod_api.get_asset(path)
+    assert result is not None, f"Failed to find asset with path: {path}"
+    assert result == first_result, f"Mismatch for path: {path}"
+    assert result.normalized_path == first_result.normalized_path
@@ -1,11 +1,13 @@
-from math import log
-from venv import logger
+import hashlib
+import os
 import pytest
 from pathlib import Path
+from typing import Iterator
+from asset_scanner import scanner_parallel
 from asset_scanner.pbo_extractor import PboExtractor
 from asset_scanner.scanner_parallel import ParallelScanner
 from asset_scanner.scanner_tasks import ScanTask, TaskPriority, TaskStatus
-from tests.conftest import BABE_EM_PBO_FILE, EM_BABE_EXPECTED, HEADBAND_EXPECTED, HEADBAND_PBO_FILE, MIRROR_EXPECTED, MIRRORFORM_PBO_FILE, PBO_FILES
+from tests.conftest import write_tree, BABE_EM_PBO_FILE, EM_BABE_EXPECTED, HEADBAND_EXPECTED, HEADBAND_PBO_FILE, MIRROR_EXPECTED, MIRRORFORM_PBO_FILE, PBO_FILES
 
 
 @pytest.fixture
@@ -19,9 +21,11 @@ def sample_pbos() -> dict:
 
 
 @pytest.fixture
-def parallel_scanner(tmp_path: Path) -> ParallelScanner:
+def parallel_scanner() -> Iterator[ParallelScanner]:
     extractor = PboExtractor()
-    return ParallelScanner(extractor, max_workers=2)
+    scanner = ParallelScanner(extractor, max_workers=2)
+    yield scanner
+    scanner.shutdown()
 
 
 def test_error_handling(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
@@ -55,6 +59,200 @@ def test_empty_directory(parallel_scanner: ParallelScanner, tmp_path: Path) -> N
     assert stats[TaskStatus.PENDING] == 0
 
 
+def test_discover_loose_files(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
+    """Test discovery of nested assets and PBOs"""
+    mod_dir = tmp_path / "@test_mod"
+    write_tree(mod_dir, {
+        "addons/main.pbo": b"dummy",
+        "data/model.P3D": b"dummy",
+        "data/textures/color.paa": b"dummy",
+        "data/readme.txt": b"ignored"
+    })
+
+    found = parallel_scanner.discover_loose_files([mod_dir])
+
+    assert found['pbos'] == [mod_dir / "addons" / "main.pbo"]
+    assert sorted(found['assets']) == [
+        mod_dir / "data" / "model.P3D",
+        mod_dir / "data" / "textures" / "color.paa",
+    ]
+
+
+def test_scan_overlapping_directories(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
+    """Test a file under several scanned directories is reported once"""
+    mod_dir = tmp_path / "@test_mod"
+    (mod_dir / "data").mkdir(parents=True)
+    (mod_dir / "data" / "model.p3d").write_bytes(b"dummy")
+    (mod_dir / "top.paa").write_bytes(b"dummy")
+
+    results = parallel_scanner.scan_directories([mod_dir / "data", mod_dir], "test")
+
+    assert sorted(r.path for r in results) == [mod_dir / "data" / "model.p3d", mod_dir / "top.paa"]
+
+
+def test_loose_asset_content_hash(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
+    """Test loose assets with identical contents share a content hash"""
+    mod_dir = tmp_path / "@test_mod"
+    mod_dir.mkdir()
+    (mod_dir / "vehicle.p3d").write_text("content1")
+    (mod_dir / "vehicle_copy.p3d").write_text("content1")
+    (mod_dir / "other.p3d").write_text("content2")
+
+    results = parallel_scanner.scan_directories([mod_dir], "@test_mod")
+    hashes = {a.filename: a.content_hash for r in results for a in r.assets}
+
+    assert hashes["vehicle.p3d"] == hashes["vehicle_copy.p3d"]
+    assert hashes["vehicle.p3d"] != hashes["other.p3d"]
+    parallel_scanner.shutdown()
+
+
+def test_large_files_not_hashed(parallel_scanner: ParallelScanner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test files over HASH_SIZE_LIMIT are identified by size and mtime without hashing"""
+    mod_dir = tmp_path / "@test_mod"
+    mod_dir.mkdir()
+    (mod_dir / "small.paa").write_bytes(b"x" * 16)
+    (mod_dir / "large.paa").write_bytes(b"x" * 64)
+    monkeypatch.setattr(parallel_scanner, "HASH_SIZE_LIMIT", 32)
+
+    results = parallel_scanner.scan_directories([mod_dir], "@test_mod")
+    assets = {a.filename: a for r in results for a in r.assets}
+
+    assert assets["small.paa"].content_hash is not None
+    assert assets["large.paa"].content_hash is None
+    assert assets["large.paa"].size == 64 and assets["large.paa"].mtime is not None
+
+
+def test_hash_file_spans_chunks(tmp_path: Path) -> None:
+    """Test mapped large files and buffered small files hash their full contents"""
+    data = os.urandom(scanner_parallel.HASH_CHUNK_SIZE + 12345)
+    blob = tmp_path / "large.paa"
+    blob.write_bytes(data)
+
+    assert scanner_parallel._hash_file(blob) == hashlib.sha256(data).hexdigest()[:32]
+
+    small = tmp_path / "small.paa"
+    small.write_bytes(data[:1000])
+    assert scanner_parallel._hash_file(small) == hashlib.sha256(data[:1000]).hexdigest()[:32]
+
+
+def test_unchanged_files_skip_rehash(parallel_scanner: ParallelScanner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a rescan reuses assets whose size and mtime are unchanged"""
+    mod_dir = tmp_path / "@test_mod"
+    mod_dir.mkdir()
+    model = mod_dir / "vehicle.p3d"
+    model.write_text("content1")
+    (mod_dir / "other.p3d").write_text("content2")
+
+    hashed = []
+    real_hash = scanner_parallel._hash_file
+    monkeypatch.setattr(scanner_parallel, "_hash_file", lambda p: hashed.append(p) or real_hash(p))
+
+    first = {a for r in parallel_scanner.scan_directories([mod_dir], "@test_mod") for a in r.assets}
+    assert len(hashed) == 2
+
+    second = {a for r in parallel_scanner.scan_directories([mod_dir], "@test_mod") for a in r.assets}
+    assert len(hashed) == 2
+    assert second == first
+
+    model.write_text("content1 changed")
+    st = model.stat()
+    os.utime(model, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    third = {a.filename: a for r in parallel_scanner.scan_directories([mod_dir], "@test_mod") for a in r.assets}
+    assert hashed[2:] == [model]
+    assert third["vehicle.p3d"].size == len("content1 changed")
+
+    parallel_scanner.scan_directories([mod_dir], "@test_mod", force_rescan=True)
+    assert len(hashed) == 5
+    parallel_scanner.shutdown()
+
+
+def test_fingerprints_forget_deleted_files(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
+    """Test a rescan drops memoized assets for files no longer found"""
+    mod_dir = tmp_path / "@test_mod"
+    write_tree(mod_dir, {"vehicle.p3d": b"content1", "other.p3d": b"content2"})
+    parallel_scanner.scan_directories([mod_dir], "@test_mod")
+    assert set(parallel_scanner._fingerprints[mod_dir]) == {str(mod_dir / "vehicle.p3d"), str(mod_dir / "other.p3d")}
+
+    (mod_dir / "other.p3d").unlink()
+    parallel_scanner.scan_directories([mod_dir], "@test_mod")
+    assert set(parallel_scanner._fingerprints[mod_dir]) == {str(mod_dir / "vehicle.p3d")}
+
+
+def test_progress_batching(tmp_path: Path) -> None:
+    """Test progress is reported per batch of files rather than per file"""
+    mod_dir = tmp_path / "@test_mod"
+    write_tree(mod_dir, {f"model_{i}.p3d": b"dummy" for i in range(200)})
+
+    updates = []
+    scanner = ParallelScanner(PboExtractor(), max_workers=2,
+                              progress_callback=lambda msg, progress: updates.append(progress))
+    scanner.PROGRESS_INTERVAL = 60
+
+    results = scanner.scan_directories([mod_dir], "@test_mod")
+    scanner.shutdown()
+
+    assert len(results) == 200
+    assert updates == [64 / 200, 128 / 200, 192 / 200, 1.0]
+
+
+def test_progress_spans_stages(mock_extractor, tmp_path: Path) -> None:
+    """Test loose files and PBO listings share one fraction that never goes back"""
+    write_tree(tmp_path, {
+        "@test_mod/data/model.p3d": b"dummy",
+        "@test_mod/data/texture.paa": b"dummy",
+        "@test_mod/addons/first.pbo": b"pbo",
+        "@test_mod/addons/second.pbo": b"pbo",
+    })
+
+    updates = []
+    scanner = ParallelScanner(mock_extractor, max_workers=2,
+                              progress_callback=lambda msg, progress: updates.append(progress))
+    scanner.PROGRESS_BATCH = 1
+    scanner.scan_directories([tmp_path / "@test_mod"], "@test_mod")
+    scanner.shutdown()
+
+    assert updates == [1 / 4, 2 / 4, 3 / 4, 1.0]
+
+
+def test_scan_pbo_contents(mock_extractor, tmp_path: Path) -> None:
+    """Test PBO listings are parsed into prefix and contents"""
+    def list_contents(path: Path):
+        if path.name == "broken.pbo":
+            return 1, "", "error"
+        return 0, "prefix=x\\test_prefix;\nconfig.cpp\ndata\\model.p3d\n", ""
+    mock_extractor.list_contents.side_effect = list_contents
+    mock_extractor.extract_prefix.return_value = "x\\test_prefix"
+
+    scanner = ParallelScanner(mock_extractor, max_workers=2)
+    good, broken = tmp_path / "good.pbo", tmp_path / "broken.pbo"
+    contents = scanner.scan_pbo_contents([good, broken])
+    scanner.shutdown()
+
+    assert contents == {good: ("x/test_prefix", {"config.cpp", "data/model.p3d"})}
+
+    # The same listing text is parsed once and the result shared
+    again = scanner.scan_pbo_contents([good])
+    assert again[good][1] is contents[good][1]
+    scanner.shutdown()
+
+
+def test_executor_reuse(parallel_scanner: ParallelScanner, tmp_path: Path) -> None:
+    """Test the worker pool persists across scans until shutdown"""
+    (tmp_path / "model.p3d").write_bytes(b"dummy")
+
+    parallel_scanner.discover_loose_files([tmp_path])
+    executor = parallel_scanner._executor
+    assert executor is not None
+
+    parallel_scanner.discover_loose_files([tmp_path])
+    assert parallel_scanner._executor is executor
+
+    parallel_scanner.shutdown()
+    assert parallel_scanner._executor is None
+    assert parallel_scanner.discover_loose_files([tmp_path])['assets'] == [tmp_path / "model.p3d"]
+    parallel_scanner.shutdown()
+
+
 def test_invalid_directory(parallel_scanner: ParallelScanner) -> None:
     """Test scanning a non-existent directory"""
     results = parallel_scanner.scan_directories([Path("/nonexistent")], "test")
@@ -0,0 +1,94 @@
+"""PboExtractor tests that do not need the extractpbo tool"""
+from pathlib import Path
+from typing import List, Tuple
+
+from asset_scanner.pbo_extractor import PboExtractor, _listing_prefix
+
+
+def test_scan_contents_cache(tmp_path: Path) -> None:
+    """Test scan results are cached per file version and bounded in size"""
+    extractor = PboExtractor()
+    listed: List[Path] = []
+
+    def list_contents(pbo_path: Path) -> Tuple[int, str, str]:
+        listed.append(pbo_path)
+        return 0, "prefix=test\\addon\ndata\\model.p3d\n", ""
+    extractor.list_contents = list_contents  # type: ignore[method-assign]
+
+    pbo = tmp_path / "addon.pbo"
+    pbo.write_bytes(b"v1")
+
+    first = extractor.scan_pbo_contents(pbo)
+    assert first == (0, {}, {"test/addon/data/model.p3d"})
+    first[2].clear()
+    assert extractor.scan_pbo_contents(pbo) == (0, {}, {"test/addon/data/model.p3d"})
+    assert len(listed) == 1
+
+    # A changed file is scanned again
+    pbo.write_bytes(b"version 2")
+    extractor.scan_pbo_contents(pbo)
+    assert len(listed) == 2
+
+    extractor.SCAN_CACHE_SIZE = 2
+    for i in range(3):
+        other = tmp_path / f"other_{i}.pbo"
+        other.write_bytes(b"data")
+        extractor.scan_pbo_contents(other)
+    assert len(extractor._scan_cache) == 2
+
+
+def test_list_contents_cache(tmp_path: Path) -> None:
+    """Test listings are reused across calls until the PBO changes"""
+    extractor = PboExtractor()
+    runs: List[Path] = []
+
+    def run_list(pbo_path: Path) -> Tuple[int, str, str]:
+        runs.append(pbo_path)
+        return (0, "prefix=test\n", "") if pbo_path.name != "bad.pbo" else (1, "", "error")
+    extractor._run_list = run_list  # type: ignore[method-assign]
+
+    pbo = tmp_path / "addon.pbo"
+    pbo.write_bytes(b"v1")
+    assert extractor.list_contents(pbo) == extractor.list_contents(pbo) == (0, "prefix=test\n", "")
+    assert len(runs) == 1
+
+    # Failures are not cached
+    bad = tmp_path / "bad.pbo"
+    bad.write_bytes(b"v1")
+    extractor.list_contents(bad)
+    extractor.list_contents(bad)
+    assert len(runs) == 3
+
+
+def test_extract_prefix() -> None:
+    """Test the first prefix line is found wherever it sits in a listing"""
+    extractor = PboExtractor()
+    listing = "\n".join(f"data\\model_{i}.p3d" for i in range(100))
+
+    assert extractor.extract_prefix("Opening x.pbo\r\nprefix=x\\addon;\r\n" + listing) == "x/addon"
+    assert extractor.extract_prefix(listing + "\nPboPrefix : x\\other;") == "x/other"
+    assert extractor.extract_prefix("PboPrefix: first\nprefix=second") == "first"
+    # Tokens inside a line do not count as a prefix line
+    assert extractor.extract_prefix("data\\prefix=x.p3d\nxPboPrefix:y") is None
+    assert extractor.extract_prefix(listing) is None
+
+    # Repeat listings, as passed on rescans, reuse the parsed prefix
+    hits = _listing_prefix.cache_info().hits
+    assert extractor.extract_prefix(listing) is None
+    assert _listing_prefix.cache_info().hits == hits + 1
+
+
+def test_read_file_with_fallback(tmp_path: Path) -> None:
+    """Test code files decode with the first encoding that fits"""
+    extractor = PboExtractor()
+    utf8 = tmp_path / "utf8.cpp"
+    utf8.write_bytes(b"\xef\xbb\xbfclass A {};\r\n// \xc3\xa9\r")
+    assert extractor._read_file_with_fallback(utf8) == "class A {};\n// \u00e9\n"
+
+    cp1252 = tmp_path / "cp1252.cpp"
+    cp1252.write_bytes(b"// \x93quoted\x94")
+    assert extractor._read_file_with_fallback(cp1252) == "// \u201cquoted\u201d"
+
+    latin1 = tmp_path / "latin1.cpp"
+    latin1.write_bytes(b"// \x81")
+    assert extractor._read_file_with_fallback(latin1) == "// \x81"